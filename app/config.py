@@ -5,6 +5,7 @@ Handles environment variables with proper validation.
 import os
 import sys
 import logging
+import functools
 from dotenv import load_dotenv
 
 logger = logging.getLogger(__name__)
@@ -40,14 +41,21 @@ def get_database_url():
     return f"postgresql://{user}:{password}@{host}:5432/{db}"
 
 # API Keys
+@functools.lru_cache(maxsize=1)
 def get_mistral_api_key():
     """Get Mistral API key with validation"""
     api_key = os.getenv('MISTRAL_API_KEY')
     return api_key  # Can be None, will be checked when OCR feature is used
 
 # Mistral API configuration
+HAS_MISTRAL_API = bool(get_mistral_api_key())
 MISTRAL_OCR_MODEL = "mistral-ocr-latest"
 MISTRAL_CHAT_MODEL = os.getenv('MISTRAL_CHAT_MODEL', 'mistral-small-latest')
+MISTRAL_VISION_MODEL = os.getenv('MISTRAL_VISION_MODEL', 'pixtral-12b-latest')
+# Days an LLM cache entry is served before it expires and is pruned
+LLM_CACHE_TTL_DAYS = int(os.getenv('LLM_CACHE_TTL_DAYS', '30'))
+# Minimum seconds between prunes of expired LLM cache entries
+LLM_CACHE_PRUNE_INTERVAL = int(os.getenv('LLM_CACHE_PRUNE_INTERVAL', '3600'))
 
 # Function to validate essential configuration at startup
 def validate_configuration():
@@ -87,6 +95,13 @@ LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
 SECRET_KEY = os.getenv('SECRET_KEY', 'default_secret_key_for_development_only')
 UPLOAD_FOLDER = os.getenv('UPLOAD_FOLDER', 'data/uploads')
 
+# Database connection pool sizing (per worker process)
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '10'))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '20'))
+# Seconds to wait for a free connection, and the age after which one is replaced
+DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', '30'))
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '3600'))
+
 # Export database URL for use in other modules
 SQLALCHEMY_DATABASE_URL = get_database_url()
 
@@ -5,7 +5,7 @@ import logging
 
 # Import all models to ensure they're registered with SQLAlchemy
 from .models import Base, Plant, SeedPacket, GardenSupply, Year, Note, Harvest
-from .config import SQLALCHEMY_DATABASE_URL
+from .config import SQLALCHEMY_DATABASE_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +13,11 @@ logger = logging.getLogger(__name__)
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
     pool_pre_ping=True,  # Enable connection health checks
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,  # Replace connections before server-side idle timeouts drop them
+    query_cache_size=1200,  # Keep compiled SQL for every handler's statements cached
 )
 
 # Add connection debugging
@@ -1,5 +1,7 @@
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+from queue import SimpleQueue
+import atexit
 import os
 import sys
 from pathlib import Path
@@ -40,12 +42,19 @@ def setup_logging(log_level=logging.INFO):
     error_handler.setFormatter(file_formatter)
     error_handler.setLevel(logging.ERROR)
 
+    # Request threads only enqueue records; a background listener thread
+    # formats them and does the console and file I/O
+    log_queue = SimpleQueue()
+    listener = QueueListener(
+        log_queue, console_handler, app_handler, error_handler, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+
     # Root logger configuration
     root_logger = logging.getLogger()
     root_logger.setLevel(log_level)
-    root_logger.addHandler(console_handler)
-    root_logger.addHandler(app_handler)
-    root_logger.addHandler(error_handler)
+    root_logger.addHandler(QueueHandler(log_queue))
 
     # FastAPI logger configuration
     fastapi_logger = logging.getLogger("fastapi")
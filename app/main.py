@@ -1,18 +1,19 @@
 from fastapi import FastAPI, Depends, Request, status
-from fastapi.responses import HTMLResponse, JSONResponse
-from fastapi.templating import Jinja2Templates
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
-from datetime import datetime
-import json
+import time
 import logging
-import pydantic
 
 from . import models
-from .database import SessionLocal, engine
+from .models import Plant, Note, SeedPacket, GardenSupply
+from .database import engine, get_db
 from .logging_config import setup_logging
 from .exceptions import GardenBaseException, ResourceNotFoundException, DatabaseOperationException
 from .config import DEBUG
+from .templating import templates
 
 # Setup logging
 logger = setup_logging()
@@ -20,64 +21,15 @@ logger = setup_logging()
 # Create database tables
 models.Base.metadata.create_all(bind=engine)
 
-# Import all schema modules first to make sure they're registered
-from app.schemas import GardenBaseModel
-from app.schemas.plants import Plant as PlantSchema
-from app.schemas.notes import Note as NoteSchema 
-from app.schemas.seed_packets import SeedPacket as SeedPacketSchema
-from app.schemas.garden_supplies import GardenSupply as GardenSupplySchema
-from app.schemas.harvests import Harvest as HarvestSchema
-
-# Now update all forward references
-from app.schemas import update_forward_refs
-update_forward_refs()
-
-# Import the router after schemas are fully loaded
+# The routes import the schema modules they need
 from .routes import router as api_router
 
-# Enhanced JSON encoder that handles Pydantic models and SQLAlchemy models
-class EnhancedJSONEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, pydantic.BaseModel):
-            # Convert Pydantic models to dict
-            return obj.model_dump()
-        if hasattr(obj, '__dict__'):
-            # Get the dictionary of attributes for SQLAlchemy models
-            data = {}
-            for key, value in obj.__dict__.items():
-                if not key.startswith('_'):  # Skip SQLAlchemy internal attributes
-                    try:
-                        json.dumps(value)  # Test if value is JSON serializable
-                        data[key] = value
-                    except (TypeError, OverflowError):
-                        # If value is not JSON serializable, convert it to string
-                        data[key] = str(value)
-            return data
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        return super().default(obj)
-
-def custom_json_dumps(obj, **kwargs):
-    return json.dumps(obj, cls=EnhancedJSONEncoder, **kwargs)
-
-# Function to convert Pydantic models to JSON-safe dictionaries
-def to_dict_filter(obj):
-    if isinstance(obj, pydantic.BaseModel):
-        return obj.model_dump()
-    return obj
-
-app = FastAPI(title="Garden Tracker API", debug=DEBUG)
+app = FastAPI(title="Garden Tracker API", debug=DEBUG, default_response_class=ORJSONResponse)
 
 # Mount static files
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 app.mount("/uploads", StaticFiles(directory="data/uploads"), name="uploads")
 
-# Set up templates with custom JSON encoder
-templates = Jinja2Templates(directory="app/templates")
-templates.env.policies['json.dumps_function'] = custom_json_dumps
-# Register the to_dict filter properly
-templates.env.filters['to_dict'] = to_dict_filter
-
 # Exception handlers
 @app.exception_handler(GardenBaseException)
 async def garden_exception_handler(request: Request, exc: GardenBaseException):
@@ -89,7 +41,7 @@ async def garden_exception_handler(request: Request, exc: GardenBaseException):
             "path": request.url.path
         }
     )
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "error": {
@@ -100,13 +52,26 @@ async def garden_exception_handler(request: Request, exc: GardenBaseException):
         }
     )
 
+# Database operation recorded in DatabaseOperationException, by HTTP method
+_DB_OPERATION_BY_METHOD = {"GET": "query", "POST": "create", "PUT": "update", "DELETE": "delete"}
+
+@app.exception_handler(SQLAlchemyError)
+async def database_exception_handler(request: Request, exc: SQLAlchemyError):
+    """Turn any database error a handler lets escape into a DatabaseOperationException response"""
+    logger.exception(
+        "Database operation failed",
+        extra={"path": request.url.path, "method": request.method}
+    )
+    operation = _DB_OPERATION_BY_METHOD.get(request.method, "query")
+    return await garden_exception_handler(request, DatabaseOperationException(operation, str(exc)))
+
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     logger.exception(
         "Unhandled exception occurred",
         extra={"path": request.url.path}
     )
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "error": {
@@ -117,74 +82,94 @@ async def general_exception_handler(request: Request, exc: Exception):
         }
     )
 
-# Database session middleware
-@app.middleware("http")
-async def db_session_middleware(request: Request, call_next):
-    try:
-        request.state.db = SessionLocal()
-        response = await call_next(request)
-        return response
-    except Exception as e:
-        logger.exception("Database session middleware error")
-        raise
-    finally:
-        request.state.db.close()
-
 # Request logging middleware
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    start_time = datetime.now()
-    try:
-        response = await call_next(request)
-        end_time = datetime.now()
-        duration = (end_time - start_time).total_seconds() * 1000
+class RequestContextMiddleware:
+    """Plain ASGI middleware that times each HTTP request and logs the outcome"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        status_code = None
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            logger.error(
+                "Request failed",
+                extra={
+                    "path": scope["path"],
+                    "method": scope["method"],
+                    "duration_ms": (time.perf_counter() - start_time) * 1000,
+                    "error": str(e)
+                }
+            )
+            raise
         logger.info(
-            f"Request completed",
-            extra={
-                "path": request.url.path,
-                "method": request.method,
-                "duration_ms": duration,
-                "status_code": response.status_code
-            }
-        )
-        return response
-    except Exception as e:
-        end_time = datetime.now()
-        duration = (end_time - start_time).total_seconds() * 1000
-        logger.error(
-            f"Request failed",
+            "Request completed",
             extra={
-                "path": request.url.path,
-                "method": request.method,
-                "duration_ms": duration,
-                "error": str(e)
+                "path": scope["path"],
+                "method": scope["method"],
+                "duration_ms": (time.perf_counter() - start_time) * 1000,
+                "status_code": status_code
             }
         )
-        raise
 
-# Dependency to get database session
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+app.add_middleware(RequestContextMiddleware)
 
 # Include the routes from the router module
 app.include_router(api_router)
 
+def check_duplicate_routes(app: FastAPI):
+    """Fail at startup if two handlers are registered for the same path and method"""
+    seen = set()
+    for route in app.routes:
+        for method in getattr(route, "methods", None) or ():
+            key = (route.path, method)
+            if key in seen:
+                raise RuntimeError(f"Duplicate route registered: {method} {route.path}")
+            seen.add(key)
+
+# Dashboard lists: only the columns home.html renders, so the rows go
+# straight to the template without ORM hydration or Pydantic validation
+RECENT_PLANTS = (
+    select(Plant.id, Plant.name, Plant.variety, Plant.planting_method, Plant.created_at)
+    .order_by(Plant.created_at.desc()).limit(5)
+)
+RECENT_NOTES = (
+    select(Note.id, Note.body, Note.image_path, Note.timestamp)
+    .order_by(Note.timestamp.desc()).limit(5)
+)
+RECENT_SEED_PACKETS = (
+    select(SeedPacket.id, SeedPacket.name, SeedPacket.variety, SeedPacket.quantity)
+    .order_by(SeedPacket.created_at.desc()).limit(5)
+)
+RECENT_SUPPLIES = (
+    select(GardenSupply.id, GardenSupply.name, GardenSupply.description)
+    .order_by(GardenSupply.created_at.desc()).limit(5)
+)
+
 # Root endpoint
 @app.get("/", response_class=HTMLResponse)
-async def home(request: Request, db: Session = Depends(get_db)):
+def home(request: Request, db: Session = Depends(get_db)):
     try:
-        # Get models from the database
-        from app.models import Plant, Note, SeedPacket, GardenSupply
-        
-        # Get summary data and convert to Pydantic models
-        plants = [PlantSchema.from_orm(p) for p in db.query(Plant).order_by(Plant.created_at.desc()).limit(5).all()]
-        notes = [NoteSchema.from_orm(n) for n in db.query(Note).order_by(Note.timestamp.desc()).limit(5).all()]
-        seed_packets = [SeedPacketSchema.from_orm(sp) for sp in db.query(SeedPacket).order_by(SeedPacket.created_at.desc()).limit(5).all()]
-        supplies = [GardenSupplySchema.from_orm(s) for s in db.query(GardenSupply).order_by(GardenSupply.created_at.desc()).limit(5).all()]
+        # Four small indexed queries on the request's session; as a sync
+        # handler this runs in the threadpool, off the event loop
+        plants = db.execute(RECENT_PLANTS).all()
+        notes = db.execute(RECENT_NOTES).all()
+        seed_packets = db.execute(RECENT_SEED_PACKETS).all()
+        supplies = db.execute(RECENT_SUPPLIES).all()
         
         logger.info("Loading home dashboard")
         return templates.TemplateResponse(
@@ -199,4 +184,6 @@ async def home(request: Request, db: Session = Depends(get_db)):
         )
     except Exception as e:
         logger.exception("Error loading home dashboard")
-        raise DatabaseOperationException("query", str(e))
\ No newline at end of file
+        raise DatabaseOperationException("query", str(e))
+
+check_duplicate_routes(app)
\ No newline at end of file
@@ -6,6 +6,7 @@ from .year import Year
 from .note import Note
 from .harvest import Harvest
 from .image import Image
+from .llm_cache import LLMCache
 
 __all__ = [
     'Base',
@@ -16,5 +17,6 @@ __all__ = [
     'Year',
     'Note',
     'Harvest',
-    'Image'
+    'Image',
+    'LLMCache'
 ]
\ No newline at end of file
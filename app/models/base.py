@@ -1,3 +1,46 @@
+from sqlalchemy import DDL, event, func
+from sqlalchemy.orm import object_session
 from sqlalchemy.ext.declarative import declarative_base
 
-Base = declarative_base()
\ No newline at end of file
+Base = declarative_base()
+
+# updated_at is maintained by the database: on Postgres a BEFORE UPDATE
+# trigger stamps it only when the row's data actually changed. Keep in sync
+# with the add_updated_at_triggers migration. Other databases have no
+# trigger, so there the ORM stamps it on flush instead.
+SET_UPDATED_AT_FUNCTION = """
+CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at := now();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+event.listen(
+    Base.metadata, "before_create", DDL(SET_UPDATED_AT_FUNCTION).execute_if(dialect="postgresql")
+)
+
+def add_updated_at_trigger(model):
+    """
+    Maintain ``model``'s updated_at: the set_updated_at trigger is installed
+    when create_all builds the table on Postgres, and ORM updates stamp the
+    column themselves on other databases.
+    """
+    event.listen(
+        model.__table__,
+        "after_create",
+        DDL(
+            "CREATE TRIGGER trg_%(table)s_updated_at BEFORE UPDATE ON %(table)s "
+            "FOR EACH ROW WHEN (OLD::text IS DISTINCT FROM NEW::text) "
+            "EXECUTE FUNCTION set_updated_at()"
+        ).execute_if(dialect="postgresql"),
+    )
+
+    @event.listens_for(model, "before_update")
+    def stamp_updated_at(mapper, connection, target):
+        # Without the trigger, stamp rows whose columns changed in this flush
+        if connection.dialect.name != "postgresql" and object_session(target).is_modified(
+            target, include_collections=False
+        ):
+            target.updated_at = func.now()
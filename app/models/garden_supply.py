@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, String, DateTime, Table, ForeignKey, func
+from sqlalchemy import Column, Integer, String, DateTime, Table, ForeignKey, func, FetchedValue
 from sqlalchemy.orm import relationship
-from .base import Base
+from .base import Base, add_updated_at_trigger
 
 # Association table for many-to-many relationship between plants and supplies
 plant_supplies = Table('plant_supplies', Base.metadata,
@@ -15,12 +15,15 @@ class GardenSupply(Base):
     name = Column(String, nullable=False)
     image_path = Column(String, nullable=True)  # Legacy field, to be migrated
     description = Column(String, nullable=True)
-    created_at = Column(DateTime, nullable=False, default=func.now())
-    updated_at = Column(DateTime, nullable=False, default=func.now(), onupdate=func.now())
+    created_at = Column(DateTime, nullable=False, default=func.now(), index=True)
+    updated_at = Column(DateTime, nullable=False, default=func.now(), server_onupdate=FetchedValue())
 
     # Relationships
-    notes = relationship("Note", backref="garden_supply")
+    plants = relationship("Plant", secondary=plant_supplies, back_populates="garden_supplies")
+    notes = relationship("Note", back_populates="garden_supply", order_by="Note.timestamp.desc()")
     images = relationship("Image", secondary="garden_supply_image", back_populates="garden_supplies")
 
     def __repr__(self):
-        return f"<GardenSupply {self.name}>"
\ No newline at end of file
+        return f"<GardenSupply {self.name}>"
+
+add_updated_at_trigger(GardenSupply)
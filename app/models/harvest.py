@@ -1,9 +1,12 @@
-from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, func
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, Index, func
 from sqlalchemy.orm import relationship
 from .base import Base
 
 class Harvest(Base):
     __tablename__ = "harvests"
+    __table_args__ = (
+        Index('ix_harvest_plant_ts', 'plant_id', 'timestamp'),
+    )
 
     id = Column(Integer, primary_key=True)
     weight_oz = Column(Float, nullable=False)
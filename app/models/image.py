@@ -1,8 +1,8 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Table, Text, JSON, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, Table, Text, JSON, DateTime, FetchedValue
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
-from .base import Base
+from .base import Base, add_updated_at_trigger
 
 # Association tables for many-to-many relationships
 seed_packet_image = Table(
@@ -50,10 +50,12 @@ class Image(Base):
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_onupdate=FetchedValue())
     
     # Relationships
     seed_packets = relationship("SeedPacket", secondary=seed_packet_image, back_populates="images")
     plants = relationship("Plant", secondary=plant_image, back_populates="images")
     garden_supplies = relationship("GardenSupply", secondary=garden_supply_image, back_populates="images")
-    notes = relationship("Note", secondary=note_image, back_populates="images")
\ No newline at end of file
+    notes = relationship("Note", secondary=note_image, back_populates="images")
+
+add_updated_at_trigger(Image)
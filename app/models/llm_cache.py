@@ -0,0 +1,13 @@
+from sqlalchemy import Column, String, Text, DateTime, func
+from .base import Base
+
+class LLMCache(Base):
+    """Exact-match cache of Mistral OCR and extraction results"""
+    __tablename__ = "llm_cache"
+
+    key = Column(String(64), primary_key=True)  # sha256 hex digest of the request inputs
+    value = Column(Text, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=func.now(), index=True)
+
+    def __repr__(self):
+        return f"<LLMCache {self.key[:12]}>"
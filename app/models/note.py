@@ -1,20 +1,30 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, func
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, func
 from sqlalchemy.orm import relationship
 from .base import Base
 
 class Note(Base):
     __tablename__ = "notes"
+    __table_args__ = (
+        # Composite indexes for the per-entity note lists, filtered by FK and sorted by time
+        Index('ix_note_plant_ts', 'plant_id', 'timestamp'),
+        Index('ix_note_seed_ts', 'seed_packet_id', 'timestamp'),
+        Index('ix_note_supply_ts', 'garden_supply_id', 'timestamp'),
+    )
     
     id = Column(Integer, primary_key=True)
     body = Column(String, nullable=False)
     image_path = Column(String, nullable=True)  # Legacy field, to be migrated
-    timestamp = Column(DateTime, nullable=False, default=func.now())
+    timestamp = Column(DateTime, nullable=False, default=func.now(), index=True)
     
     # Foreign Keys
     plant_id = Column(Integer, ForeignKey('plants.id'), nullable=True)
     seed_packet_id = Column(Integer, ForeignKey('seed_packets.id'), nullable=True)
     garden_supply_id = Column(Integer, ForeignKey('garden_supplies.id'), nullable=True)
     
+    # Relationships
+    plant = relationship("Plant", back_populates="notes")
+    seed_packet = relationship("SeedPacket", back_populates="notes")
+    garden_supply = relationship("GardenSupply", back_populates="notes")
     # New relationship with images
     images = relationship("Image", secondary="note_image", back_populates="notes")
     
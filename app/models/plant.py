@@ -1,7 +1,7 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Enum, DateTime, func
+from sqlalchemy import Column, Integer, String, ForeignKey, Enum, DateTime, func, FetchedValue
 from sqlalchemy.orm import relationship
 import enum
-from .base import Base
+from .base import Base, add_updated_at_trigger
 
 class PlantingMethod(str, enum.Enum):
     RAISED_BED = "Raised Bed"
@@ -19,20 +19,22 @@ class Plant(Base):
     name = Column(String, nullable=False)
     variety = Column(String)  # New field
     planting_method = Column(Enum(PlantingMethod, native_enum=True, create_type=False), nullable=False)
-    created_at = Column(DateTime, nullable=False, default=func.now())
-    updated_at = Column(DateTime, nullable=False, default=func.now(), onupdate=func.now())
+    created_at = Column(DateTime, nullable=False, default=func.now(), index=True)
+    updated_at = Column(DateTime, nullable=False, default=func.now(), server_onupdate=FetchedValue())
     
     # Foreign Keys
     year_id = Column(Integer, ForeignKey('years.year'), nullable=False)
     seed_packet_id = Column(Integer, ForeignKey('seed_packets.id'), nullable=True)
     
     # Relationships
-    year = relationship("Year", backref="plants")
-    seed_packet = relationship("SeedPacket", backref="plants")
-    garden_supplies = relationship("GardenSupply", secondary="plant_supplies", backref="plants")
-    notes = relationship("Note", backref="plant")
+    year = relationship("Year", back_populates="plants")
+    seed_packet = relationship("SeedPacket", back_populates="plants")
+    garden_supplies = relationship("GardenSupply", secondary="plant_supplies", back_populates="plants")
+    notes = relationship("Note", back_populates="plant", order_by="Note.timestamp.desc()")
     harvests = relationship("Harvest", back_populates="plant")
     images = relationship("Image", secondary="plant_image", back_populates="plants")
     
     def __repr__(self):
-        return f"<Plant {self.name}>"
\ No newline at end of file
+        return f"<Plant {self.name}>"
+
+add_updated_at_trigger(Plant)
@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, String, DateTime, Date, Float, func
+from sqlalchemy import Column, Integer, String, DateTime, Date, Float, func, FetchedValue
 from sqlalchemy.orm import relationship
-from .base import Base
+from .base import Base, add_updated_at_trigger
 
 class SeedPacket(Base):
     __tablename__ = "seed_packets"
@@ -17,12 +17,15 @@ class SeedPacket(Base):
     watering = Column(String, nullable=True)
     quantity = Column(Integer, nullable=False)
     image_path = Column(String, nullable=True)  # Legacy field, to be migrated
-    created_at = Column(DateTime, nullable=False, default=func.now())
-    updated_at = Column(DateTime, nullable=False, default=func.now(), onupdate=func.now())
+    created_at = Column(DateTime, nullable=False, default=func.now(), index=True)
+    updated_at = Column(DateTime, nullable=False, default=func.now(), server_onupdate=FetchedValue())
     
     # Relationships
-    notes = relationship("Note", backref="seed_packet")
+    plants = relationship("Plant", back_populates="seed_packet")
+    notes = relationship("Note", back_populates="seed_packet", order_by="Note.timestamp.desc()")
     images = relationship("Image", secondary="seed_packet_image", back_populates="seed_packets")
 
     def __repr__(self):
-        return f"<SeedPacket {self.name}>"
\ No newline at end of file
+        return f"<SeedPacket {self.name}>"
+
+add_updated_at_trigger(SeedPacket)
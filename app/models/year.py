@@ -1,4 +1,5 @@
 from sqlalchemy import Column, Integer, func
+from sqlalchemy.orm import relationship
 from .base import Base
 
 class Year(Base):
@@ -7,5 +8,8 @@ class Year(Base):
     id = Column(Integer, primary_key=True)
     year = Column(Integer, unique=True, nullable=False, default=lambda: func.extract('year', func.current_date()))
 
+    # Relationships
+    plants = relationship("Plant", back_populates="year")
+
     def __repr__(self):
         return f"<Year {self.year}>"
\ No newline at end of file
@@ -1,24 +1,25 @@
 from fastapi import APIRouter, Depends, Request, HTTPException, Form, Query
-from fastapi.templating import Jinja2Templates
 from fastapi.responses import HTMLResponse
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload, contains_eager
 from sqlalchemy import extract, func
-from datetime import datetime, date
+from datetime import datetime, date, time
 import logging
 
 from app.database import get_db
+from app.templating import templates
 from app.models import Harvest as HarvestModel, Plant as PlantModel
 from app.schemas.harvests import Harvest, HarvestCreate
 from app.exceptions import ResourceNotFoundException, DatabaseOperationException
+from app.services import reference_data
+from app.utils import stream_model_list
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
-templates = Jinja2Templates(directory="app/templates")
 
 @router.post("/harvests/", response_model=Harvest)
 def create_harvest(harvest: HarvestCreate, db: Session = Depends(get_db)):
-    db_harvest = HarvestModel(**harvest.dict())
+    db_harvest = HarvestModel(**harvest.model_dump())
     db.add(db_harvest)
     db.commit()
     db.refresh(db_harvest)
@@ -31,19 +32,19 @@ def list_harvests(
     date_to: Optional[date] = None,
     db: Session = Depends(get_db)
 ):
-    query = db.query(HarvestModel)
+    query = db.query(HarvestModel).options(joinedload(HarvestModel.plant))
     if plant_id:
         query = query.filter(HarvestModel.plant_id == plant_id)
     if date_from:
         query = query.filter(HarvestModel.timestamp >= date_from)
     if date_to:
         query = query.filter(HarvestModel.timestamp <= date_to)
-    return query.all()
+    return stream_model_list(Harvest, query)
 
 @router.get("/harvests/{harvest_id}")
 def get_harvest(harvest_id: int, db: Session = Depends(get_db)):
     try:
-        harvest = db.query(HarvestModel).filter(HarvestModel.id == harvest_id).first()
+        harvest = db.get(HarvestModel, harvest_id)
         if harvest is None:
             raise ResourceNotFoundException("Harvest", harvest_id)
         return harvest
@@ -55,11 +56,11 @@ def get_harvest(harvest_id: int, db: Session = Depends(get_db)):
 
 @router.put("/harvests/{harvest_id}", response_model=Harvest)
 def update_harvest(harvest_id: int, harvest: HarvestCreate, db: Session = Depends(get_db)):
-    db_harvest = db.query(HarvestModel).filter(HarvestModel.id == harvest_id).first()
+    db_harvest = db.get(HarvestModel, harvest_id)
     if db_harvest is None:
         raise HTTPException(status_code=404, detail="Harvest not found")
     
-    for key, value in harvest.dict().items():
+    for key, value in harvest.model_dump().items():
         setattr(db_harvest, key, value)
     
     db.commit()
@@ -68,79 +69,76 @@ def update_harvest(harvest_id: int, harvest: HarvestCreate, db: Session = Depend
 
 @router.delete("/harvests/{harvest_id}")
 def delete_harvest(harvest_id: int, db: Session = Depends(get_db)):
-    harvest = db.query(HarvestModel).filter(HarvestModel.id == harvest_id).first()
-    if harvest is None:
+    # Harvests have no dependent rows, so a single DELETE replaces the load-then-delete
+    deleted = db.query(HarvestModel).filter(HarvestModel.id == harvest_id).delete(synchronize_session=False)
+    if not deleted:
         raise HTTPException(status_code=404, detail="Harvest not found")
-    db.delete(harvest)
     db.commit()
     return {"message": "Harvest deleted"}
 
 @router.get("/harvests", response_class=HTMLResponse)
-async def harvests_page(
+def harvests_page(
     request: Request,
     plant_id: Optional[int] = None,
-    date_min: Optional[str] = Query(None, description="Minimum date in YYYY-MM-DD format"),
-    date_max: Optional[str] = Query(None, description="Maximum date in YYYY-MM-DD format"),
+    date_min: Optional[date] = Query(None, description="Minimum date in YYYY-MM-DD format"),
+    date_max: Optional[date] = Query(None, description="Maximum date in YYYY-MM-DD format"),
     db: Session = Depends(get_db)
 ):
-    from app.utils import apply_filters
-    
-    query = db.query(HarvestModel)
-    
-    # Convert string dates to datetime objects for filtering
+    # Build the filter conditions once; the list and the total share them
+    conditions = []
+    # Dates are parsed by FastAPI; widen them to cover the whole day
     if date_min:
-        query = query.filter(HarvestModel.timestamp >= datetime.fromisoformat(f"{date_min}T00:00:00"))
+        conditions.append(HarvestModel.timestamp >= datetime.combine(date_min, time.min))
     if date_max:
-        query = query.filter(HarvestModel.timestamp <= datetime.fromisoformat(f"{date_max}T23:59:59"))
-    
-    # Apply plant filter
+        conditions.append(HarvestModel.timestamp <= datetime.combine(date_max, time.max))
     if plant_id:
-        query = query.filter(HarvestModel.plant_id == plant_id)
+        conditions.append(HarvestModel.plant_id == plant_id)
     
-    # Get the harvests ordered by timestamp
-    harvests = query.order_by(HarvestModel.timestamp.desc()).all()
+    # Each row shows its plant; fill the relationship from the joined columns
+    harvests = (
+        db.query(HarvestModel)
+        .join(HarvestModel.plant)
+        .options(contains_eager(HarvestModel.plant))
+        .filter(*conditions)
+        .order_by(HarvestModel.timestamp.desc())
+        .all()
+    )
     
     # Get plants for dropdown filter
-    plants = db.query(PlantModel).order_by(PlantModel.name).all()
+    plants = reference_data.get_plants(db)
     
-    # Calculate summary statistics
-    total_weight = sum(harvest.weight_oz for harvest in harvests)
+    # Monthly totals and the grand total in one statement: the grand total is
+    # a window sum over the monthly groups
+    year_col = extract('year', HarvestModel.timestamp)
+    month_col = extract('month', HarvestModel.timestamp)
+    monthly_totals = (
+        db.query(
+            year_col.label('year'),
+            month_col.label('month'),
+            func.sum(HarvestModel.weight_oz).label('total_weight'),
+            func.sum(func.sum(HarvestModel.weight_oz)).over().label('grand_total')
+        )
+        .filter(*conditions)
+        .group_by(year_col, month_col)
+        .order_by(year_col.desc(), month_col.desc())
+        .all()
+    )
+    total_weight = monthly_totals[0].grand_total if monthly_totals else 0.0
     
-    # Calculate monthly stats
     monthly_stats = []
-    if harvests:
-        # Query for monthly totals
-        monthly_totals = (
-            db.query(
-                extract('year', HarvestModel.timestamp).label('year'),
-                extract('month', HarvestModel.timestamp).label('month'),
-                func.sum(HarvestModel.weight_oz).label('total_weight')
-            )
-            .filter(HarvestModel.plant_id == plant_id if plant_id else True)
-            .group_by(
-                extract('year', HarvestModel.timestamp),
-                extract('month', HarvestModel.timestamp)
-            )
-            .order_by(
-                extract('year', HarvestModel.timestamp).desc(),
-                extract('month', HarvestModel.timestamp).desc()
-            )
-            .all()
-        )
-        
-        for year, month, weight in monthly_totals:
-            month_date = date(int(year), int(month), 1)
-            month_name = month_date.strftime("%B %Y")
-            monthly_stats.append({
-                "month": month_name,
-                "weight_oz": weight,
-                "weight_lbs": weight / 16
-            })
+    for year, month, weight, _ in monthly_totals:
+        month_date = date(int(year), int(month), 1)
+        month_name = month_date.strftime("%B %Y")
+        monthly_stats.append({
+            "month": month_name,
+            "weight_oz": weight,
+            "weight_lbs": weight / 16
+        })
     
     # Get plant-specific stats if needed
     plant_stats = None
     if plant_id:
-        plant = db.query(PlantModel).filter(PlantModel.id == plant_id).first()
+        plant = db.get(PlantModel, plant_id)
         if plant:
             plant_stats = {
                 "name": plant.name,
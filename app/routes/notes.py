@@ -1,21 +1,22 @@
 from fastapi import APIRouter, Depends, Query, Request, File, Form, UploadFile, HTTPException
-from fastapi.templating import Jinja2Templates
 from fastapi.responses import HTMLResponse
+from fastapi.concurrency import run_in_threadpool
 from typing import List, Optional
-from sqlalchemy.orm import Session
-from datetime import datetime
+from sqlalchemy.orm import Session, joinedload, selectinload
+from datetime import datetime, date, time
 import logging
 
 from app.database import get_db
-from app.models import Note as NoteModel, Plant as PlantModel, SeedPacket as SeedPacketModel, GardenSupply as GardenSupplyModel
+from app.templating import templates
+from app.models import Note as NoteModel
 from app.schemas.notes import Note, NoteCreate
 from app.forms.notes import NoteCreateForm
-from app.utils import save_upload_file, delete_upload_file, apply_filters
+from app.utils import save_upload_file, delete_upload_file, apply_filters, paginate, stream_template, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from app.exceptions import ResourceNotFoundException, DatabaseOperationException
+from app.services import reference_data
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
-templates = Jinja2Templates(directory="app/templates")
 
 @router.post("/notes/", response_model=Note)
 async def create_note(
@@ -25,7 +26,7 @@ async def create_note(
     try:
         image_path = None
         if form.image and form.image.filename:
-            image_path = save_upload_file(form.image)
+            image_path = await run_in_threadpool(save_upload_file, form.image)
         
         db_note = NoteModel(
             body=form.body,
@@ -47,21 +48,26 @@ def list_notes(
     plant_id: Optional[int] = None,
     seed_packet_id: Optional[int] = None,
     garden_supply_id: Optional[int] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[int] = Query(None, description="Return notes with an id lower than this"),
     db: Session = Depends(get_db)
 ):
-    query = db.query(NoteModel)
+    query = db.query(NoteModel).options(selectinload(NoteModel.images))
+    if cursor:
+        query = query.filter(NoteModel.id < cursor)
     if plant_id:
         query = query.filter(NoteModel.plant_id == plant_id)
     if seed_packet_id:
         query = query.filter(NoteModel.seed_packet_id == seed_packet_id)
     if garden_supply_id:
         query = query.filter(NoteModel.garden_supply_id == garden_supply_id)
-    return query.all()
+    notes, _ = paginate(query.order_by(NoteModel.id.desc()), limit)
+    return notes
 
 @router.get("/notes/{note_id}")
 def get_note(note_id: int, request: Request, db: Session = Depends(get_db)):
     try:
-        note = db.query(NoteModel).filter(NoteModel.id == note_id).first()
+        note = db.get(NoteModel, note_id)
         if note is None:
             raise ResourceNotFoundException("Note", note_id)
             
@@ -93,7 +99,7 @@ async def update_note(
     garden_supply_id: Optional[int] = Form(None),
     db: Session = Depends(get_db)
 ):
-    db_note = db.query(NoteModel).filter(NoteModel.id == note_id).first()
+    db_note = db.get(NoteModel, note_id)
     if db_note is None:
         raise HTTPException(status_code=404, detail="Note not found")
     
@@ -102,7 +108,7 @@ async def update_note(
         # Delete old image if it exists
         delete_upload_file(db_note.image_path)
         # Save new image
-        image_path = save_upload_file(image)
+        image_path = await run_in_threadpool(save_upload_file, image)
         db_note.image_path = image_path
     
     db_note.body = body
@@ -116,7 +122,7 @@ async def update_note(
 
 @router.delete("/notes/{note_id}")
 def delete_note(note_id: int, db: Session = Depends(get_db)):
-    note = db.query(NoteModel).filter(NoteModel.id == note_id).first()
+    note = db.get(NoteModel, note_id)
     if note is None:
         raise HTTPException(status_code=404, detail="Note not found")
     
@@ -128,22 +134,31 @@ def delete_note(note_id: int, db: Session = Depends(get_db)):
     return {"message": "Note deleted"}
 
 @router.get("/notes", response_class=HTMLResponse)
-async def notes_page(
+def notes_page(
     request: Request,
     plant_id: Optional[int] = None,
     seed_packet_id: Optional[int] = None,
     supply_id: Optional[int] = None,
-    date_min: Optional[str] = Query(None, description="Minimum date in YYYY-MM-DD format"),
-    date_max: Optional[str] = Query(None, description="Maximum date in YYYY-MM-DD format"),
+    date_min: Optional[date] = Query(None, description="Minimum date in YYYY-MM-DD format"),
+    date_max: Optional[date] = Query(None, description="Maximum date in YYYY-MM-DD format"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[int] = Query(None, description="Return notes with an id lower than this"),
     db: Session = Depends(get_db)
 ):
-    query = db.query(NoteModel)
+    # The list shows each note's plant, seed packet and supply badges
+    query = db.query(NoteModel).options(
+        joinedload(NoteModel.plant),
+        joinedload(NoteModel.seed_packet),
+        joinedload(NoteModel.garden_supply),
+    )
+    if cursor:
+        query = query.filter(NoteModel.id < cursor)
     
-    # Convert string dates to datetime objects for filtering
+    # Dates are parsed by FastAPI; widen them to cover the whole day
     if date_min:
-        query = query.filter(NoteModel.timestamp >= datetime.fromisoformat(f"{date_min}T00:00:00"))
+        query = query.filter(NoteModel.timestamp >= datetime.combine(date_min, time.min))
     if date_max:
-        query = query.filter(NoteModel.timestamp <= datetime.fromisoformat(f"{date_max}T23:59:59"))
+        query = query.filter(NoteModel.timestamp <= datetime.combine(date_max, time.max))
     
     # Apply other filters
     filters = {
@@ -153,12 +168,14 @@ async def notes_page(
     }
     
     query = apply_filters(query, NoteModel, filters)
-    notes = query.order_by(NoteModel.timestamp.desc()).all()
+    # Notes are timestamped on insert, so id order matches timestamp order
+    notes, has_more = paginate(query.order_by(NoteModel.id.desc()), limit)
+    next_url = str(request.url.include_query_params(cursor=notes[-1].id)) if has_more else None
     
     # Get related objects for filtering dropdowns
-    plants = db.query(PlantModel).order_by(PlantModel.name).all()
-    seed_packets = db.query(SeedPacketModel).order_by(SeedPacketModel.name).all()
-    supplies = db.query(GardenSupplyModel).order_by(GardenSupplyModel.name).all()
+    plants = reference_data.get_plants(db)
+    seed_packets = reference_data.get_seed_packets(db)
+    supplies = reference_data.get_garden_supplies(db)
     
     # Add date filters back for form display
     filters.update({
@@ -166,7 +183,8 @@ async def notes_page(
         "date_max": date_max
     })
     
-    return templates.TemplateResponse(
+    return stream_template(
+        templates,
         "notes/list.html",
         {
             "request": request,
@@ -174,6 +192,7 @@ async def notes_page(
             "plants": plants,
             "seed_packets": seed_packets,
             "supplies": supplies,
-            "filters": filters
+            "filters": filters,
+            "next_url": next_url
         }
     )
\ No newline at end of file
@@ -1,26 +1,32 @@
-from fastapi import APIRouter, Depends, Request, HTTPException, status
-from fastapi.templating import Jinja2Templates
+from fastapi import APIRouter, Depends, Query, Request, HTTPException, status
 from fastapi.responses import HTMLResponse, RedirectResponse
 from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import extract
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import extract, and_, or_, select, bindparam
 from datetime import datetime
+import functools
 import logging
 
 from app.database import get_db
+from app.templating import templates
 from app.models.plant import PlantingMethod
-from app.models import Plant as PlantModel, Year as YearModel, SeedPacket as SeedPacketModel
+from app.models import Plant as PlantModel, Year as YearModel
 from app.schemas.plants import Plant, PlantCreate
 from app.exceptions import ResourceNotFoundException, DatabaseOperationException
+from app.utils import apply_filters, model_list_response, paginate, stream_template, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.services import reference_data, serialization_cache
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
-templates = Jinja2Templates(directory="app/templates")
+
+# Planting methods never change at runtime; build the dropdown values once
+PLANTING_METHODS = tuple(PlantingMethod)
+PLANTING_METHOD_VALUES = tuple(method.value for method in PlantingMethod)
 
 @router.post("/plants/", response_model=Plant)
 def create_plant(plant: PlantCreate, db: Session = Depends(get_db)):
     try:
-        logger.info("Creating new plant", extra={"plant_data": plant.dict()})
+        logger.info("Creating new plant", extra={"plant_data": plant.model_dump()})
         
         current_year = db.query(YearModel).filter(
             YearModel.year == extract('year', datetime.now())
@@ -33,7 +39,7 @@ def create_plant(plant: PlantCreate, db: Session = Depends(get_db)):
             db.refresh(current_year)
 
         # Create plant data dict and remove seed_packet_id if it's empty
-        plant_data = plant.dict()
+        plant_data = plant.model_dump(exclude_unset=True)
         if not plant_data.get('seed_packet_id'):
             plant_data.pop('seed_packet_id', None)
 
@@ -49,6 +55,28 @@ def create_plant(plant: PlantCreate, db: Session = Depends(get_db)):
         logger.exception("Failed to create plant")
         raise DatabaseOperationException("create", str(e))
 
+# list_plants query parameter -> Plant column it filters on
+_PLANT_LIST_FILTERS = {
+    "planting_method": PlantModel.planting_method,
+    "variety": PlantModel.variety,
+    "year": PlantModel.year_id,
+    "seed_packet_id": PlantModel.seed_packet_id,
+}
+
+# One cached statement per subset of the filter names
+@functools.lru_cache(maxsize=2 ** len(_PLANT_LIST_FILTERS))
+def _plant_list_statement(filter_names: frozenset):
+    """
+    Build the list_plants SELECT for one combination of provided filters.
+    Values are bound parameters, so each filter shape is built (and its SQL
+    compiled) once and reused for every request with that shape.
+    """
+    # The Plant schema includes year and images; load them for the whole page at once
+    stmt = select(PlantModel).options(joinedload(PlantModel.year), selectinload(PlantModel.images))
+    for name in sorted(filter_names):
+        stmt = stmt.where(_PLANT_LIST_FILTERS[name] == bindparam(name))
+    return stmt
+
 @router.get("/plants/", response_model=List[Plant])
 def list_plants(
     planting_method: Optional[PlantingMethod] = None,
@@ -57,36 +85,42 @@ def list_plants(
     seed_packet_id: Optional[int] = None,
     db: Session = Depends(get_db)
 ):
-    query = db.query(PlantModel)
-    if planting_method:
-        query = query.filter(PlantModel.planting_method == planting_method)
-    if variety:
-        query = query.filter(PlantModel.variety == variety)
-    if year:
-        query = query.filter(PlantModel.year_id == year)
-    if seed_packet_id:
-        query = query.filter(PlantModel.seed_packet_id == seed_packet_id)
-    return query.all()
+    params = {
+        name: value
+        for name, value in (
+            ("planting_method", planting_method),
+            ("variety", variety),
+            ("year", year),
+            ("seed_packet_id", seed_packet_id)
+        )
+        if value
+    }
+    stmt = _plant_list_statement(frozenset(params))
+    return model_list_response(Plant, db.execute(stmt, params).scalars().all())
 
 @router.get("/plants/{plant_id}")
 def get_plant(plant_id: int, request: Request, db: Session = Depends(get_db)):
     try:
-        plant = db.query(PlantModel).filter(PlantModel.id == plant_id).first()
+        wants_html = "text/html" in request.headers.get("accept", "")
+        
+        # The detail page shows the year and seed packet; join them into the lookup
+        options = [joinedload(PlantModel.year), joinedload(PlantModel.seed_packet)] if wants_html else None
+        plant = db.get(PlantModel, plant_id, options=options)
         if plant is None:
             raise ResourceNotFoundException("Plant", plant_id)
             
-        # Get all seed packets for the dropdown
-        seed_packets = db.query(SeedPacketModel).order_by(SeedPacketModel.name).all()
+        # The seed packet dropdown only needs ids and names
+        seed_packets = reference_data.get_seed_packet_options(db)
             
         # HTML response
-        if "text/html" in request.headers.get("accept", ""):
+        if wants_html:
             return templates.TemplateResponse(
                 "plants/detail.html",
                 {
                     "request": request,
                     "plant": plant,
                     "seed_packets": seed_packets,
-                    "planting_methods": list(PlantingMethod)
+                    "planting_methods": PLANTING_METHODS
                 }
             )
         # API JSON response
@@ -103,7 +137,7 @@ def get_plant(plant_id: int, request: Request, db: Session = Depends(get_db)):
                 "id": packet.id,
                 "name": packet.name
             } for packet in seed_packets],
-            "planting_methods": [method.value for method in PlantingMethod]
+            "planting_methods": PLANTING_METHOD_VALUES
         }
             
     except ResourceNotFoundException:
@@ -114,12 +148,12 @@ def get_plant(plant_id: int, request: Request, db: Session = Depends(get_db)):
 
 @router.put("/plants/{plant_id}", response_model=Plant)
 def update_plant(plant_id: int, plant: PlantCreate, db: Session = Depends(get_db)):
-    db_plant = db.query(PlantModel).filter(PlantModel.id == plant_id).first()
+    db_plant = db.get(PlantModel, plant_id)
     if db_plant is None:
         raise HTTPException(status_code=404, detail="Plant not found")
     
     # Create a dict of updates and remove seed_packet_id if it's empty
-    update_data = plant.dict()
+    update_data = plant.model_dump()
     if not update_data.get('seed_packet_id'):
         update_data.pop('seed_packet_id', None)
     
@@ -132,7 +166,7 @@ def update_plant(plant_id: int, plant: PlantCreate, db: Session = Depends(get_db
 
 @router.delete("/plants/{plant_id}")
 def delete_plant(plant_id: int, db: Session = Depends(get_db)):
-    plant = db.query(PlantModel).filter(PlantModel.id == plant_id).first()
+    plant = db.get(PlantModel, plant_id)
     if plant is None:
         raise HTTPException(status_code=404, detail="Plant not found")
     db.delete(plant)
@@ -140,11 +174,11 @@ def delete_plant(plant_id: int, db: Session = Depends(get_db)):
     return {"message": "Plant deleted"}
 
 @router.post("/plants/{plant_id}/duplicate", response_model=Plant)
-async def duplicate_plant(plant_id: int, db: Session = Depends(get_db)):
+def duplicate_plant(plant_id: int, db: Session = Depends(get_db)):
     """Duplicate a plant with all its properties except unique identifiers"""
     try:
         # Get the original plant
-        original = db.query(PlantModel).filter(PlantModel.id == plant_id).first()
+        original = db.get(PlantModel, plant_id)
         if original is None:
             raise HTTPException(status_code=404, detail="Plant not found")
 
@@ -166,7 +200,7 @@ async def duplicate_plant(plant_id: int, db: Session = Depends(get_db)):
         raise DatabaseOperationException("create", str(e))
 
 @router.get("/plants", response_class=HTMLResponse)
-async def plants_page(
+def plants_page(
     request: Request,
     name: Optional[str] = None,
     variety: Optional[str] = None,
@@ -174,11 +208,11 @@ async def plants_page(
     year_id: Optional[int] = None,
     seed_packet_id: Optional[int] = None,
     supply_id: Optional[int] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[int] = Query(None, description="Id of the last plant on the previous page"),
     db: Session = Depends(get_db)
 ):
-    from app.utils import apply_filters
-    
-    query = db.query(PlantModel)
+    query = db.query(PlantModel).options(joinedload(PlantModel.year), selectinload(PlantModel.images))
     filters = {
         "name": name,
         "variety": variety,
@@ -189,54 +223,41 @@ async def plants_page(
     query = apply_filters(query, PlantModel, filters)
     
     if supply_id:
-        query = query.filter(PlantModel.supplies.any(id=supply_id))
+        query = query.filter(PlantModel.garden_supplies.any(id=supply_id))
     
-    db_plants = query.order_by(PlantModel.name).all()
-    plants = [Plant.from_orm(plant) for plant in db_plants]
+    # Keyset pagination on (name, id): resume after the last plant of the previous page
+    if cursor:
+        anchor = db.query(PlantModel.name, PlantModel.id).filter(PlantModel.id == cursor).first()
+        if anchor:
+            query = query.filter(or_(
+                PlantModel.name > anchor.name,
+                and_(PlantModel.name == anchor.name, PlantModel.id > anchor.id)
+            ))
     
-    years = db.query(YearModel).order_by(YearModel.year.desc()).all()
-    seed_packets = db.query(SeedPacketModel).order_by(SeedPacketModel.name).all()
+    db_plants, has_more = paginate(query.order_by(PlantModel.name, PlantModel.id), limit)
+    next_url = str(request.url.include_query_params(cursor=db_plants[-1].id)) if has_more else None
+    plants = [
+        serialization_cache.cached_model(
+            Plant, plant, (plant.updated_at, plant.year.year, serialization_cache.images_version(plant))
+        )
+        for plant in db_plants
+    ]
     
-    # Importing here to avoid circular imports
-    from app.models import GardenSupply as GardenSupplyModel
-    supplies = db.query(GardenSupplyModel).order_by(GardenSupplyModel.name).all()
+    years = reference_data.get_years(db)
+    seed_packets = reference_data.get_seed_packets(db)
+    supplies = reference_data.get_garden_supplies(db)
     
-    return templates.TemplateResponse(
+    return stream_template(
+        templates,
         "plants/list.html",
         {
             "request": request,
             "plants": plants,
-            "planting_methods": list(PlantingMethod),
+            "planting_methods": PLANTING_METHODS,
             "years": years,
             "seed_packets": seed_packets,
             "supplies": supplies,
-            "filters": filters
+            "filters": filters,
+            "next_url": next_url
         }
     )
-
-@router.get("/plants/{plant_id}", response_class=HTMLResponse)
-async def plant_detail(request: Request, plant_id: int, db: Session = Depends(get_db)):
-    try:
-        plant = db.query(PlantModel).filter(PlantModel.id == plant_id).first()
-        if plant is None:
-            logger.warning(f"Plant with ID {plant_id} not found")
-            raise ResourceNotFoundException("Plant", plant_id)
-            
-        # Get all seed packets for the dropdown
-        seed_packets = db.query(SeedPacketModel).order_by(SeedPacketModel.name).all()
-            
-        logger.info(f"Retrieved plant details", extra={"plant_id": plant_id})
-        return templates.TemplateResponse(
-            "plants/detail.html",
-            {
-                "request": request,
-                "plant": plant,
-                "seed_packets": seed_packets,
-                "planting_methods": list(PlantingMethod)
-            }
-        )
-    except ResourceNotFoundException:
-        raise
-    except Exception as e:
-        logger.exception(f"Error retrieving plant details", extra={"plant_id": plant_id})
-        raise DatabaseOperationException("query", str(e))
\ No newline at end of file
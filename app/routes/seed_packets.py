@@ -1,26 +1,148 @@
 from fastapi import APIRouter, Depends, Request, HTTPException, Form, File, UploadFile, status
-from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 import logging
 from datetime import datetime
 import os
-import base64
+from uuid import uuid4
 import json
-from mistralai import Mistral
+import orjson
+from pydantic import TypeAdapter, ValidationError
+import asyncio
+import aiofiles
+from mistralai import Mistral, ImageURLChunk, TextChunk
 
 from app.database import get_db
-from app.models import SeedPacket as SeedPacketModel, Note as NoteModel
-from app.schemas.seed_packets import SeedPacket, SeedPacketCreate
+from app.templating import templates
+from app.models import SeedPacket as SeedPacketModel, Note as NoteModel, Plant as PlantModel
+from app.schemas.seed_packets import SeedPacket, SeedPacketCreate, SeedPacketExtract
 from app.forms.seed_packets import SeedPacketCreateForm
-from app.utils import save_upload_file, delete_upload_file, apply_filters, validate_image
+from app.utils import save_upload_file, delete_upload_file, apply_filters, validate_image, model_list_response, list_adapter, link_or_copy_file, image_data_url, image_format_for
 from app.exceptions import ResourceNotFoundException, DatabaseOperationException, FileUploadException
-from app.config import get_mistral_api_key, MISTRAL_OCR_MODEL, MISTRAL_CHAT_MODEL
+from app.config import HAS_MISTRAL_API, MISTRAL_OCR_MODEL, MISTRAL_CHAT_MODEL, MISTRAL_VISION_MODEL
+from app.services.mistral import get_mistral_client, ocr_pages, ocr_first_page_text
+from app.services import llm_cache
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
-templates = Jinja2Templates(directory="app/templates")
+
+# Everything the SeedPacket schema serializes, loaded with one IN query per relationship
+_SEED_PACKET_SCHEMA_LOADS = (
+    selectinload(SeedPacketModel.plants).joinedload(PlantModel.year),
+    selectinload(SeedPacketModel.plants).selectinload(PlantModel.images),
+    selectinload(SeedPacketModel.notes).selectinload(NoteModel.images),
+    selectinload(SeedPacketModel.images),
+)
+
+# Bump whenever an extraction prompt below changes so cached results are not reused
+PROMPT_VERSION = "3"
+
+# Placeholder OCR text sent back when nothing was recognised; extraction over it is pointless
+NO_OCR_TEXT_MESSAGE = "No text could be extracted from the image."
+
+def _has_ocr_content(ocr_text: str) -> bool:
+    """False for blank OCR text or the placeholder above, which an LLM can only answer with nulls"""
+    stripped = ocr_text.strip()
+    return bool(stripped) and stripped != NO_OCR_TEXT_MESSAGE
+
+# A filled-in SeedPacketExtract is well under this; the cap stops a runaway reply
+EXTRACTION_MAX_TOKENS = 512
+
+# Most texts one batch extraction may send; each adds to the prompt and to max_tokens
+MAX_BATCH_EXTRACT = 20
+
+# Extraction prompts. The static instructions always come first and the OCR
+# text is appended last, so requests share a byte-identical prefix that
+# Mistral can serve from its prompt cache.
+_OCR_TEXT_HEADER = "\n\nText from seed packet:\n"
+
+_STRUCTURED_DATA_INSTRUCTIONS = (
+    "Convert the seed packet OCR markdown below into a sensible structured JSON object with fields for "
+    "name, variety, description, planting_instructions, days_to_germination, spacing, sun_exposure, "
+    "soil_type, watering. The output should be strictly JSON with no extra commentary."
+)
+
+# The fields the extract-data prompt asks for; an empty OCR result answers with these, all null
+_DATA_EXTRACTION_FIELDS = (
+    "name", "variety", "description", "planting_instructions", "days_to_germination",
+    "spacing", "sun_exposure", "soil_type", "watering",
+)
+
+_DATA_EXTRACTION_INSTRUCTIONS = """Extract these fields from the seed packet text (return as JSON):
+- name: Plant name (e.g., "Tomato")
+- variety: Variety name (e.g., "Roma")
+- description: Brief description
+- planting_instructions: How to plant
+- days_to_germination: Number of days (just the number)
+- spacing: Recommended spacing
+- sun_exposure: Light requirements
+- soil_type: Soil preferences
+- watering: Watering instructions
+
+Only return a JSON object with these fields. Use null for missing information."""
+
+_PACKET_FIELD_GUIDELINES = """IMPORTANT FORMATTING GUIDELINES:
+- For the "name" field, provide ONLY the basic plant type (Tomato, Carrot, Lettuce, etc.) without varieties
+- For the "title" field, provide the full name as it appears on the packet 
+- For the "variety" field, extract the specific cultivar name separate from the basic name
+
+For example:
+- If the text mentions "Roma Tomatoes", then name="Tomato", variety="Roma"
+- If the text mentions "Jubilee Tomato", then name="Tomato", variety="Jubilee"
+- If the text mentions "Cherry Belle Radish", then name="Radish", variety="Cherry Belle"
+
+Extract these specific fields in JSON format:
+- name: Basic plant type (just "Tomato", "Carrot", etc.) without varieties
+- title: The complete name as shown on the packet
+- variety: Specific variety or cultivar name
+- description: Brief description of the plant
+- planting_instructions: How to plant the seeds
+- days_to_germination: Number of days until germination
+- spacing: Recommended spacing between plants
+- sun_exposure: Light requirements
+- soil_type: Soil requirements
+- watering: Watering needs
+"""
+
+_PACKET_JSON_ONLY = "\nReturn ONLY a JSON object with these fields. Use null for missing information."
+
+_PACKET_EXTRACTION_INSTRUCTIONS = (
+    "I need to extract detailed information from a seed packet's OCR text, given at the end.\n\n"
+    + _PACKET_FIELD_GUIDELINES + _PACKET_JSON_ONLY
+)
+
+_PACKET_INFO_INSTRUCTIONS = (
+    "I need to extract information from a seed packet's OCR text, given at the end.\n\n"
+    + _PACKET_FIELD_GUIDELINES
+    + "- expiration_date: Date in YYYY-MM-DD format (if available)\n"
+    + _PACKET_JSON_ONLY
+)
+
+_IMAGE_EXTRACTION_PROMPT = (
+    "I need to extract detailed information from the attached photo of a seed packet. "
+    "Read the text on the packet and use it to fill in the fields below.\n\n"
+    + _PACKET_FIELD_GUIDELINES + _PACKET_JSON_ONLY
+)
+
+def _with_ocr_text(instructions: str, ocr_text: str) -> str:
+    """Append the per-request OCR text after a static instruction block"""
+    return instructions + _OCR_TEXT_HEADER + ocr_text
+
+_PACKET_BATCH_INSTRUCTIONS = (
+    "I need to extract information from the OCR text of several seed packets, given at the end. "
+    "Each packet's text starts with a line of the form '=== PACKET n ==='.\n\n"
+    + _PACKET_FIELD_GUIDELINES
+    + "\nReturn ONLY a JSON object of the form {\"packets\": [...]} holding one object with these fields "
+    "per packet, in the same order as the packets. Use null for missing information."
+)
+
+_EXTRACT_LIST_ADAPTER = TypeAdapter(List[SeedPacketExtract])
+
+def _parse_extraction(response_content: str) -> dict:
+    """Validate an extraction reply against SeedPacketExtract, keeping only the fields the model returned"""
+    return SeedPacketExtract.model_validate_json(response_content).model_dump(mode="json", exclude_unset=True)
 
 @router.post("/seed-packets/", response_model=SeedPacket)
 async def create_seed_packet(
@@ -29,7 +151,7 @@ async def create_seed_packet(
 ):
     image_path = None
     if form.image and form.image.filename:
-        image_path = save_upload_file(form.image)
+        image_path = await run_in_threadpool(save_upload_file, form.image)
     
     db_seed_packet = SeedPacketModel(
         name=form.name,
@@ -51,22 +173,28 @@ async def create_seed_packet(
 
 @router.get("/seed-packets/", response_model=List[SeedPacket])
 def list_seed_packets(db: Session = Depends(get_db)):
-    return db.query(SeedPacketModel).all()
+    return model_list_response(SeedPacket, db.query(SeedPacketModel).options(*_SEED_PACKET_SCHEMA_LOADS).all())
 
 @router.get("/seed-packets/{seed_packet_id}")
 def get_seed_packet(seed_packet_id: int, request: Request, db: Session = Depends(get_db)):
     try:
-        seed_packet = db.query(SeedPacketModel).filter(SeedPacketModel.id == seed_packet_id).first()
+        wants_html = "text/html" in request.headers.get("accept", "")
+        
+        # The detail page lists the packet's plants; load them with the packet
+        options = [selectinload(SeedPacketModel.plants)] if wants_html else None
+        seed_packet = db.get(SeedPacketModel, seed_packet_id, options=options)
         if seed_packet is None:
             raise ResourceNotFoundException("Seed Packet", seed_packet_id)
             
         # HTML response
-        if "text/html" in request.headers.get("accept", ""):
-            # Sort notes by timestamp descending
-            sorted_notes = sorted(seed_packet.notes, key=lambda x: x.timestamp, reverse=True)
-            
-            # Check if Mistral API key is available
-            has_mistral_api = bool(get_mistral_api_key())
+        if wants_html:
+            # Sort notes by timestamp descending in SQL
+            sorted_notes = (
+                db.query(NoteModel)
+                .filter(NoteModel.seed_packet_id == seed_packet_id)
+                .order_by(NoteModel.timestamp.desc())
+                .all()
+            )
             
             return templates.TemplateResponse(
                 "seed_packets/detail.html",
@@ -74,7 +202,7 @@ def get_seed_packet(seed_packet_id: int, request: Request, db: Session = Depends
                     "request": request,
                     "seed_packet": seed_packet,
                     "notes": sorted_notes,
-                    "has_mistral_api": has_mistral_api
+                    "has_mistral_api": HAS_MISTRAL_API
                 }
             )
         # API JSON response
@@ -102,7 +230,7 @@ async def update_seed_packet(
     image: UploadFile = File(None),
     db: Session = Depends(get_db)
 ):
-    db_seed_packet = db.query(SeedPacketModel).filter(SeedPacketModel.id == seed_packet_id).first()
+    db_seed_packet = db.get(SeedPacketModel, seed_packet_id)
     if db_seed_packet is None:
         raise HTTPException(status_code=404, detail="Seed packet not found")
     
@@ -111,7 +239,7 @@ async def update_seed_packet(
         # Delete old image if it exists
         delete_upload_file(db_seed_packet.image_path)
         # Save new image
-        image_path = save_upload_file(image)
+        image_path = await run_in_threadpool(save_upload_file, image)
         db_seed_packet.image_path = image_path
     
     # Update all fields
@@ -135,7 +263,7 @@ async def duplicate_seed_packet(seed_packet_id: int, db: Session = Depends(get_d
     """Duplicate a seed packet with all its properties except unique identifiers"""
     try:
         # Get the original seed packet
-        original = db.query(SeedPacketModel).filter(SeedPacketModel.id == seed_packet_id).first()
+        original = db.get(SeedPacketModel, seed_packet_id)
         if original is None:
             raise HTTPException(status_code=404, detail="Seed packet not found")
 
@@ -156,10 +284,6 @@ async def duplicate_seed_packet(seed_packet_id: int, db: Session = Depends(get_d
         # If original has an image, copy it
         if original.image_path:
             try:
-                from shutil import copyfile
-                import os
-                from uuid import uuid4
-                
                 # Generate new unique filename and path
                 ext = os.path.splitext(original.image_path)[1]
                 new_filename = f"{uuid4()}{ext}"
@@ -168,8 +292,8 @@ async def duplicate_seed_packet(seed_packet_id: int, db: Session = Depends(get_d
                 source_path = os.path.join("/app/app/static/uploads", os.path.basename(original.image_path))
                 new_path = os.path.join("/app/app/static/uploads", new_filename)
                 
-                # Copy the file
-                copyfile(source_path, new_path)
+                # Hard-link (or copy) the file in a worker thread so the event loop keeps serving requests
+                await asyncio.to_thread(link_or_copy_file, source_path, new_path)
                 db_seed_packet.image_path = f"/uploads/{new_filename}"
             except Exception as e:
                 logger.warning(f"Failed to copy image for duplicated seed packet: {str(e)}")
@@ -186,7 +310,7 @@ async def duplicate_seed_packet(seed_packet_id: int, db: Session = Depends(get_d
 
 @router.delete("/seed-packets/{seed_packet_id}")
 def delete_seed_packet(seed_packet_id: int, db: Session = Depends(get_db)):
-    seed_packet = db.query(SeedPacketModel).filter(SeedPacketModel.id == seed_packet_id).first()
+    seed_packet = db.get(SeedPacketModel, seed_packet_id)
     if seed_packet is None:
         raise HTTPException(status_code=404, detail="Seed packet not found")
     
@@ -206,113 +330,108 @@ async def process_seed_packet_ocr(
     """OCR extraction with structured data capabilities for seed packet images"""
     try:
         # Get the seed packet
-        seed_packet = db.query(SeedPacketModel).filter(SeedPacketModel.id == seed_packet_id).first()
+        seed_packet = db.get(SeedPacketModel, seed_packet_id)
         if seed_packet is None:
             logger.error(f"Seed packet {seed_packet_id} not found")
-            return JSONResponse(status_code=404, content={"error": "Seed packet not found"})
+            return ORJSONResponse(status_code=404, content={"error": "Seed packet not found"})
             
         # Check if there's an image
         if not seed_packet.image_path:
             logger.error(f"No image path for seed packet {seed_packet_id}")
-            return JSONResponse(status_code=400, content={"error": "No image available for this seed packet"})
+            return ORJSONResponse(status_code=400, content={"error": "No image available for this seed packet"})
             
-        # Get the API key
-        api_key = get_mistral_api_key()
-        if not api_key:
+        # Get the shared Mistral client
+        client = get_mistral_client()
+        if client is None:
             logger.error("MISTRAL_API_KEY not set")
-            return JSONResponse(status_code=500, content={"error": "MISTRAL_API_KEY not set"})
-            
-        # Initialize Mistral client
-        from mistralai import Mistral, ImageURLChunk, TextChunk
-        client = Mistral(api_key=api_key)
+            return ORJSONResponse(status_code=500, content={"error": "MISTRAL_API_KEY not set"})
         
         # Extract just the filename from the database path
         filename = os.path.basename(seed_packet.image_path)
-        logger.info(f"Image filename: {filename}")
+        logger.debug("Image filename: %s", filename)
         
         # This is the key fix - we know the exact path inside Docker container
         image_path = f"/app/app/static/uploads/{filename}"
-        logger.info(f"Looking for image at Docker path: {image_path}")
+        logger.debug("Looking for image at Docker path: %s", image_path)
         
         # Check if file exists
-        if not os.path.exists(image_path):
+        if not await asyncio.to_thread(os.path.exists, image_path):
             logger.error(f"Image file not found at Docker path: {image_path}")
-            return JSONResponse(status_code=404, content={"error": "Image file not found"})
+            return ORJSONResponse(status_code=404, content={"error": "Image file not found"})
             
-        # Base64 encode the image
-        with open(image_path, "rb") as image_file:
-            base64_image = base64.b64encode(image_file.read()).decode('utf-8')
+        # Read and base64 encode the image without blocking the event loop
+        async with aiofiles.open(image_path, "rb") as image_file:
+            image_bytes = await image_file.read()
             
         # Determine format from extension
-        image_format = "jpeg"  # Default format
-        if image_path.lower().endswith(".png"):
-            image_format = "png"
-        elif image_path.lower().endswith((".jpg", ".jpeg")):
-            image_format = "jpeg"
+        image_format = image_format_for(image_path)
             
-        # Create data URL for API calls
-        base64_data_url = f"data:image/{image_format};base64,{base64_image}"
+        # Create data URL for API calls, encoding off the event loop
+        base64_data_url = await asyncio.to_thread(image_data_url, image_bytes, image_format)
         
-        # Make OCR call using modern approach
-        ocr_response = client.ocr.process(
-            document=ImageURLChunk(image_url=base64_data_url),
-            model="mistral-ocr-latest"
-        )
+        # Reuse the OCR text if this exact image has been processed before
+        ocr_cache_key = llm_cache.image_key(image_bytes)
+        ocr_text = await run_in_threadpool(llm_cache.get, db, ocr_cache_key) or ""
         
-        # Extract OCR text from response
-        ocr_text = ""
-        ocr_raw = {}
-        
-        if hasattr(ocr_response, 'pages') and ocr_response.pages:
-            ocr_text = ocr_response.pages[0].markdown
-            # Get raw response for debugging
-            ocr_raw = json.loads(ocr_response.json())
+        if not ocr_text:
+            # Make OCR call using modern approach
+            ocr_response = await client.ocr.process_async(
+                document=ImageURLChunk(image_url=base64_data_url),
+                model="mistral-ocr-latest"
+            )
+            
+            # Extract OCR text from response
+            ocr_text = ocr_first_page_text(ocr_response)
+            if ocr_text.strip():
+                await run_in_threadpool(llm_cache.put, ocr_cache_key, ocr_text)
         
         # If we get no text, provide a simple message
         if not ocr_text.strip():
             logger.warning("No text extracted from image")
-            ocr_text = "No text could be extracted from the image."
-            return JSONResponse(content={"status": "warning", "ocr_text": ocr_text})
+            ocr_text = NO_OCR_TEXT_MESSAGE
+            return ORJSONResponse(content={"status": "warning", "ocr_text": ocr_text})
         
         # Extract structured data using Pixtral model
         structured_data = {}
         try:
             # Use Pixtral to extract structured data from the image and OCR text
             logger.info("Calling Pixtral model for structured data extraction")
-            chat_response = client.chat.complete(
+            chat_response = await client.chat.complete_async(
                 model="pixtral-12b-latest",
                 messages=[
                     {
                         "role": "user",
                         "content": [
                             ImageURLChunk(image_url=base64_data_url),
-                            TextChunk(text=f"This is image's OCR in markdown:\n<BEGIN_IMAGE_OCR>\n{ocr_text}\n<END_IMAGE_OCR>.\nConvert this into a sensible structured JSON object with fields for name, variety, description, planting_instructions, days_to_germination, spacing, sun_exposure, soil_type, watering. The output should be strictly JSON with no extra commentary.")
+                            TextChunk(text=_with_ocr_text(_STRUCTURED_DATA_INSTRUCTIONS, ocr_text))
                         ],
                     },
                 ],
                 response_format={"type": "json_object"},
-                temperature=0
+                temperature=0,
+                max_tokens=EXTRACTION_MAX_TOKENS
             )
             # Parse the structured response
-            structured_data = json.loads(chat_response.choices[0].message.content)
-            logger.info(f"Successfully extracted structured data: {json.dumps(structured_data)[:100]}...")
+            structured_data = _parse_extraction(chat_response.choices[0].message.content)
+            logger.debug("Successfully extracted structured data: %.100s", structured_data)
         except Exception as e:
             logger.warning(f"Error using Pixtral for structured data: {str(e)}")
             # Fall back to using ministral if pixtral fails
             try:
                 logger.info("Falling back to Ministral model")
-                chat_response = client.chat.complete(
+                chat_response = await client.chat.complete_async(
                     model="ministral-8b-latest",
                     messages=[
                         {
                             "role": "user",
-                            "content": f"This is image's OCR in markdown:\n<BEGIN_IMAGE_OCR>\n{ocr_text}\n<END_IMAGE_OCR>.\nConvert this into a sensible structured JSON object with fields for name, variety, description, planting_instructions, days_to_germination, spacing, sun_exposure, soil_type, watering. The output should be strictly JSON with no extra commentary."
+                            "content": _with_ocr_text(_STRUCTURED_DATA_INSTRUCTIONS, ocr_text)
                         },
                     ],
                     response_format={"type": "json_object"},
-                    temperature=0
+                    temperature=0,
+                    max_tokens=EXTRACTION_MAX_TOKENS
                 )
-                structured_data = json.loads(chat_response.choices[0].message.content)
+                structured_data = _parse_extraction(chat_response.choices[0].message.content)
             except Exception as inner_e:
                 logger.error(f"Error using fallback model: {str(inner_e)}")
                 structured_data = {}
@@ -329,7 +448,7 @@ async def process_seed_packet_ocr(
         db.refresh(db_note)
         
         # Return both the OCR text and structured data
-        return JSONResponse(content={
+        return ORJSONResponse(content={
             "status": "success", 
             "ocr_text": ocr_text,
             "structured_data": structured_data
@@ -337,7 +456,7 @@ async def process_seed_packet_ocr(
         
     except Exception as e:
         logger.exception(f"Error in OCR: {str(e)}")
-        return JSONResponse(status_code=500, content={"error": f"OCR failed: {str(e)}"})
+        return ORJSONResponse(status_code=500, content={"error": f"OCR failed: {str(e)}"})
 
 @router.post("/seed-packets/{seed_packet_id}/extract-data")
 async def extract_data_from_ocr(
@@ -349,146 +468,209 @@ async def extract_data_from_ocr(
     """Extract structured data from OCR text"""
     try:
         # Basic validation
-        seed_packet = db.query(SeedPacketModel).filter(SeedPacketModel.id == seed_packet_id).first()
+        seed_packet = db.get(SeedPacketModel, seed_packet_id)
         if seed_packet is None:
-            return JSONResponse(status_code=404, content={"error": "Seed packet not found"})
-
-        # Get API key
-        api_key = get_mistral_api_key()
-        if not api_key:
-            return JSONResponse(status_code=500, content={"error": "MISTRAL_API_KEY not set"})
+            return ORJSONResponse(status_code=404, content={"error": "Seed packet not found"})
 
-        # Initialize client
-        client = Mistral(api_key=api_key)
+        # Nothing to extract from an empty OCR result
+        if not _has_ocr_content(ocr_text):
+            return ORJSONResponse(content=dict.fromkeys(_DATA_EXTRACTION_FIELDS))
 
-        # Simple prompt
-        prompt = f"""
-Extract these fields from the seed packet text (return as JSON):
-- name: Plant name (e.g., "Tomato")
-- variety: Variety name (e.g., "Roma")
-- description: Brief description
-- planting_instructions: How to plant
-- days_to_germination: Number of days (just the number)
-- spacing: Recommended spacing
-- sun_exposure: Light requirements
-- soil_type: Soil preferences
-- watering: Watering instructions
+        # Answer repeated extractions of the same text from the cache
+        cache_key = llm_cache.prompt_key("extract-data", PROMPT_VERSION, ocr_text)
+        cached = await run_in_threadpool(llm_cache.get, db, cache_key)
+        if cached is not None:
+            return Response(content=cached, media_type="application/json")
 
-Only return a JSON object with these fields. Use null for missing information.
+        # Get the shared Mistral client
+        client = get_mistral_client()
+        if client is None:
+            return ORJSONResponse(status_code=500, content={"error": "MISTRAL_API_KEY not set"})
 
-Text from seed packet:
-{ocr_text}
-"""
+        # Simple prompt
+        prompt = _with_ocr_text(_DATA_EXTRACTION_INSTRUCTIONS, ocr_text)
         # Simple message structure
         messages = [
             {"role": "user", "content": prompt}
         ]
 
         # Make API call
-        chat_response = client.chat.complete(
+        chat_response = await client.chat.complete_async(
             model=MISTRAL_CHAT_MODEL,
-            messages=messages
+            messages=messages,
+            response_format={"type": "json_object"},
+            temperature=0,
+            max_tokens=EXTRACTION_MAX_TOKENS
         )
 
         # Extract response
         response_content = chat_response.choices[0].message.content
         
         # Basic parsing
-        import json
         try:
-            extracted_data = json.loads(response_content)
-            return JSONResponse(content=extracted_data)
-        except json.JSONDecodeError:
-            return JSONResponse(
+            extracted_data = _parse_extraction(response_content)
+            await run_in_threadpool(llm_cache.put, cache_key, orjson.dumps(extracted_data).decode())
+            return ORJSONResponse(content=extracted_data)
+        except ValidationError:
+            return ORJSONResponse(
                 status_code=500,
                 content={"error": "Could not parse response as JSON"}
             )
             
     except Exception as e:
         logger.exception(f"Error extracting data: {str(e)}")
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"error": f"Data extraction failed: {str(e)}"}
         )
 
+def _sse_event(event: str, data) -> str:
+    """Format a single server-sent event"""
+    return f"event: {event}\ndata: {orjson.dumps(data).decode()}\n\n"
+
+async def _stream_temp_ocr(client: Mistral, base64_data_url: str, db: Session, ocr_cache_key: str):
+    """Run OCR and extraction for a temporary image, emitting each stage as it finishes.
+
+    Each OCR page is sent as an ``ocr`` event as soon as the OCR call returns,
+    so the client can show progress while the chat extraction is still running.
+    """
+    ocr_text = await run_in_threadpool(llm_cache.get, db, ocr_cache_key)
+    if ocr_text:
+        yield _sse_event("ocr", {"index": 0, "markdown": ocr_text})
+    else:
+        try:
+            ocr_response = await client.ocr.process_async(
+                document=ImageURLChunk(image_url=base64_data_url),
+                model="mistral-ocr-latest"
+            )
+        except Exception as e:
+            logger.error(f"OCR API call failed: {str(e)}")
+            yield _sse_event("error", {"error": f"OCR processing failed: {str(e)}"})
+            return
+
+        for page in ocr_pages(ocr_response):
+            yield _sse_event("ocr", {"index": page.index, "markdown": page.markdown})
+
+        ocr_text = ocr_first_page_text(ocr_response)
+        if ocr_text.strip():
+            await run_in_threadpool(llm_cache.put, ocr_cache_key, ocr_text)
+
+    if not ocr_text.strip():
+        logger.warning("No text extracted from image")
+        yield _sse_event("warning", {
+            "ocr_text": NO_OCR_TEXT_MESSAGE,
+            "warning": "No text was detected in the image"
+        })
+        return
+
+    structured_data = {}
+    extraction_cache_key = llm_cache.prompt_key("ocr-temp", PROMPT_VERSION, ocr_text)
+    try:
+        response_content = await run_in_threadpool(llm_cache.get, db, extraction_cache_key)
+        if response_content is None:
+            chat_response = await client.chat.complete_async(
+                model=MISTRAL_CHAT_MODEL,
+                messages=[
+                    {
+                        "role": "user",
+                        "content": _with_ocr_text(_PACKET_EXTRACTION_INSTRUCTIONS, ocr_text)
+                    },
+                ],
+                response_format={"type": "json_object"},
+                temperature=0,
+                max_tokens=EXTRACTION_MAX_TOKENS
+            )
+            response_content = chat_response.choices[0].message.content
+            structured_data = _parse_extraction(response_content)
+            await run_in_threadpool(llm_cache.put, extraction_cache_key, orjson.dumps(structured_data).decode())
+        else:
+            structured_data = orjson.loads(response_content)
+    except Exception as e:
+        logger.warning(f"Error extracting structured data: {str(e)}")
+    yield _sse_event("structured", structured_data)
+
 @router.post("/seed-packets/ocr-temp")
 async def process_temp_ocr(
+    request: Request,
     image: UploadFile = File(...),
-    request: Request = None,
     db: Session = Depends(get_db)
 ):
     """Process OCR on a temporary image during seed packet creation"""
     try:
         # Check if there's an image
         if not image or not image.filename:
-            return JSONResponse(status_code=400, content={"error": "No image file provided"})
+            return ORJSONResponse(status_code=400, content={"error": "No image file provided"})
             
         # Log that we're starting OCR processing
-        logger.info(f"Starting OCR processing for temporary image: {image.filename}")
+        logger.info("Starting OCR processing for temporary image: %s", image.filename)
             
-        # Get the API key
-        api_key = get_mistral_api_key()
-        if not api_key:
+        # Get the shared Mistral client
+        client = get_mistral_client()
+        if client is None:
             logger.error("MISTRAL_API_KEY not set")
-            return JSONResponse(status_code=500, content={"error": "MISTRAL_API_KEY not set"})
-            
-        # Initialize Mistral client - without the unsupported client_options
-        from mistralai import Mistral, ImageURLChunk, TextChunk
-        client = Mistral(api_key=api_key)
+            return ORJSONResponse(status_code=500, content={"error": "MISTRAL_API_KEY not set"})
         
         # Validate and read the image
         try:
             validate_image(image)
             contents = await image.read()
-            base64_image = base64.b64encode(contents).decode('utf-8')
             # Reset file pointer for potential future use
             await image.seek(0) if hasattr(image.seek, '__await__') else image.file.seek(0)
             
-            logger.info(f"Image read successfully, size: {len(contents)} bytes")
+            logger.info("Image read successfully, size: %d bytes", len(contents))
         except Exception as e:
             logger.error(f"Error reading image: {str(e)}")
-            return JSONResponse(status_code=400, content={"error": f"Invalid image: {str(e)}"})
+            return ORJSONResponse(status_code=400, content={"error": f"Invalid image: {str(e)}"})
             
         # Determine format from extension
-        image_format = "jpeg"  # Default format
-        if image.filename.lower().endswith(".png"):
-            image_format = "png"
-        elif image.filename.lower().endswith((".jpg", ".jpeg")):
-            image_format = "jpeg"
+        image_format = image_format_for(image.filename)
             
         # Create data URL for API calls
-        base64_data_url = f"data:image/{image_format};base64,{base64_image}"
+        base64_data_url = await asyncio.to_thread(image_data_url, contents, image_format)
         
-        # Log before making OCR call
-        logger.info("Making OCR API call to Mistral...")
+        ocr_cache_key = llm_cache.image_key(contents)
         
-        # Make OCR call using modern approach - with appropriate settings
-        try:
-            ocr_response = client.ocr.process(
-                document=ImageURLChunk(image_url=base64_data_url),
-                model="mistral-ocr-latest"
+        # Clients that accept an event stream get each stage as it completes
+        if "text/event-stream" in request.headers.get("accept", ""):
+            return StreamingResponse(
+                _stream_temp_ocr(client, base64_data_url, db, ocr_cache_key),
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache"}
             )
-            logger.info("OCR API call completed successfully")
-        except Exception as e:
-            logger.error(f"OCR API call failed: {str(e)}")
-            return JSONResponse(status_code=500, content={"error": f"OCR processing failed: {str(e)}"})
         
-        # Extract OCR text from response
-        ocr_text = ""
+        # Log before making OCR call
+        logger.info("Making OCR API call to Mistral...")
         
-        if hasattr(ocr_response, 'pages') and ocr_response.pages:
-            ocr_text = ocr_response.pages[0].markdown
+        # Reuse the OCR text if this exact image has been processed before
+        ocr_text = await run_in_threadpool(llm_cache.get, db, ocr_cache_key) or ""
+        
+        if not ocr_text:
+            # Make OCR call using modern approach - with appropriate settings
+            try:
+                ocr_response = await client.ocr.process_async(
+                    document=ImageURLChunk(image_url=base64_data_url),
+                    model="mistral-ocr-latest"
+                )
+                logger.info("OCR API call completed successfully")
+            except Exception as e:
+                logger.error(f"OCR API call failed: {str(e)}")
+                return ORJSONResponse(status_code=500, content={"error": f"OCR processing failed: {str(e)}"})
+            
+            # Extract OCR text from response
+            ocr_text = ocr_first_page_text(ocr_response)
+            if ocr_text.strip():
+                await run_in_threadpool(llm_cache.put, ocr_cache_key, ocr_text)
         
         # If we get no text, provide a simple message
         if not ocr_text.strip():
             logger.warning("No text extracted from image")
-            return JSONResponse(content={
+            return ORJSONResponse(content={
                 "status": "warning", 
-                "ocr_text": "No text could be extracted from the image.",
+                "ocr_text": NO_OCR_TEXT_MESSAGE,
                 "warning": "No text was detected in the image"
             })
         
-        logger.info(f"OCR extracted text: {ocr_text[:200]}...")
+        logger.debug("OCR extracted text: %.200s", ocr_text)
         
         # Extract structured data using Pixtral model
         structured_data = {}
@@ -496,53 +678,32 @@ async def process_temp_ocr(
             # Use a simpler approach with only OCR text - faster and more reliable
             logger.info("Processing OCR text for structured data...")
             
-            # Extract structured data from OCR text only - no image analysis (faster)
-            text_extraction_prompt = f"""
-I need to extract detailed information from a seed packet's OCR text.
-Here's the text from the seed packet:
-
-{ocr_text}
-
-IMPORTANT FORMATTING GUIDELINES:
-- For the "name" field, provide ONLY the basic plant type (Tomato, Carrot, Lettuce, etc.) without varieties
-- For the "title" field, provide the full name as it appears on the packet 
-- For the "variety" field, extract the specific cultivar name separate from the basic name
-
-For example:
-- If the text mentions "Roma Tomatoes", then name="Tomato", variety="Roma"
-- If the text mentions "Jubilee Tomato", then name="Tomato", variety="Jubilee"
-- If the text mentions "Cherry Belle Radish", then name="Radish", variety="Cherry Belle"
-
-Extract these specific fields in JSON format:
-- name: Basic plant type (just "Tomato", "Carrot", etc.) without varieties
-- title: The complete name as shown on the packet
-- variety: Specific variety or cultivar name
-- description: Brief description of the plant
-- planting_instructions: How to plant the seeds
-- days_to_germination: Number of days until germination
-- spacing: Recommended spacing between plants
-- sun_exposure: Light requirements
-- soil_type: Soil requirements
-- watering: Watering needs
-
-Return ONLY a JSON object with these fields. Use null for missing information.
-"""
-            
-            # Set a shorter timeout for this call
-            chat_response = client.chat.complete(
-                model=MISTRAL_CHAT_MODEL,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": text_extraction_prompt
-                    },
-                ],
-                response_format={"type": "json_object"},
-                temperature=0
-            )
+            extraction_cache_key = llm_cache.prompt_key("ocr-temp", PROMPT_VERSION, ocr_text)
+            response_content = await run_in_threadpool(llm_cache.get, db, extraction_cache_key)
             
-            structured_data = json.loads(chat_response.choices[0].message.content)
-            logger.info(f"Successfully extracted structured data: {json.dumps(structured_data)[:100]}...")
+            if response_content is None:
+                # Extract structured data from OCR text only - no image analysis (faster)
+                text_extraction_prompt = _with_ocr_text(_PACKET_EXTRACTION_INSTRUCTIONS, ocr_text)
+                
+                # Set a shorter timeout for this call
+                chat_response = await client.chat.complete_async(
+                    model=MISTRAL_CHAT_MODEL,
+                    messages=[
+                        {
+                            "role": "user",
+                            "content": text_extraction_prompt
+                        },
+                    ],
+                    response_format={"type": "json_object"},
+                    temperature=0,
+                    max_tokens=EXTRACTION_MAX_TOKENS
+                )
+                response_content = chat_response.choices[0].message.content
+                structured_data = _parse_extraction(response_content)
+                await run_in_threadpool(llm_cache.put, extraction_cache_key, orjson.dumps(structured_data).decode())
+            else:
+                structured_data = orjson.loads(response_content)
+            logger.debug("Successfully extracted structured data: %.100s", structured_data)
             
         except Exception as e:
             logger.warning(f"Error extracting structured data: {str(e)}")
@@ -550,7 +711,7 @@ Return ONLY a JSON object with these fields. Use null for missing information.
         
         # Return the OCR text and any structured data we managed to extract
         logger.info("OCR processing completed, returning results")
-        return JSONResponse(content={
+        return ORJSONResponse(content={
             "status": "success", 
             "ocr_text": ocr_text,
             "structured_data": structured_data
@@ -558,10 +719,74 @@ Return ONLY a JSON object with these fields. Use null for missing information.
         
     except Exception as e:
         logger.exception(f"Error in temp OCR: {str(e)}")
-        return JSONResponse(status_code=500, content={"error": f"OCR failed: {str(e)}"})
+        return ORJSONResponse(status_code=500, content={"error": f"OCR failed: {str(e)}"})
+
+@router.post("/seed-packets/upload-ocr-extract")
+async def upload_ocr_extract(
+    image: UploadFile = File(...),
+    db: Session = Depends(get_db)
+):
+    """Read and extract seed packet fields from an image in a single vision chat call.
+
+    Unlike /seed-packets/ocr-temp followed by /seed-packets/extract-info, this
+    makes one Mistral round-trip per image instead of two.
+    """
+    try:
+        if not image or not image.filename:
+            return ORJSONResponse(status_code=400, content={"error": "No image file provided"})
+            
+        client = get_mistral_client()
+        if client is None:
+            logger.error("MISTRAL_API_KEY not set")
+            return ORJSONResponse(status_code=500, content={"error": "MISTRAL_API_KEY not set"})
+            
+        try:
+            validate_image(image)
+            contents = await image.read()
+        except Exception as e:
+            logger.error(f"Error reading image: {str(e)}")
+            return ORJSONResponse(status_code=400, content={"error": f"Invalid image: {str(e)}"})
+            
+        cache_key = llm_cache.prompt_key("upload-ocr-extract", PROMPT_VERSION, llm_cache.image_key(contents))
+        response_content = await run_in_threadpool(llm_cache.get, db, cache_key)
+        
+        if response_content is None:
+            # Determine format from extension
+            image_format = image_format_for(image.filename)
+                
+            base64_data_url = await asyncio.to_thread(image_data_url, contents, image_format)
+            chat_response = await client.chat.complete_async(
+                model=MISTRAL_VISION_MODEL,
+                messages=[
+                    {
+                        "role": "user",
+                        "content": [
+                            ImageURLChunk(image_url=base64_data_url),
+                            TextChunk(text=_IMAGE_EXTRACTION_PROMPT)
+                        ],
+                    },
+                ],
+                response_format={"type": "json_object"},
+                temperature=0,
+                max_tokens=EXTRACTION_MAX_TOKENS
+            )
+            response_content = chat_response.choices[0].message.content
+            structured_data = _parse_extraction(response_content)
+            await run_in_threadpool(llm_cache.put, cache_key, orjson.dumps(structured_data).decode())
+        else:
+            structured_data = orjson.loads(response_content)
+            
+        return ORJSONResponse(content={
+            "status": "success",
+            "structured_data": structured_data
+        })
+        
+    except Exception as e:
+        logger.exception(f"Error in single-call OCR extraction: {str(e)}")
+        return ORJSONResponse(status_code=500, content={"error": f"OCR failed: {str(e)}"})
 
 @router.post("/seed-packets/extract-info")
-async def extract_info_from_ocr_text(request: Request):
+async def extract_info_from_ocr_text(request: Request, db: Session = Depends(get_db)):
     """Extract structured data from OCR text for seed packet creation"""
     try:
         # Get the request body
@@ -569,59 +794,40 @@ async def extract_info_from_ocr_text(request: Request):
         ocr_text = body.get('ocr_text')
         
         if not ocr_text:
-            return JSONResponse(status_code=400, content={"error": "No OCR text provided"})
+            return ORJSONResponse(status_code=400, content={"error": "No OCR text provided"})
             
-        # Get API key
-        api_key = get_mistral_api_key()
-        if not api_key:
-            return JSONResponse(status_code=500, content={"error": "MISTRAL_API_KEY not set"})
-
-        # Initialize client
-        client = Mistral(api_key=api_key)
+        # The model can only return nulls for an empty OCR result, which is reported as below
+        if not _has_ocr_content(ocr_text):
+            return ORJSONResponse(
+                status_code=400,
+                content={"error": "Could not extract meaningful information from the image text"}
+            )
+            
+        # Answer repeated extractions of the same text from the cache
+        cache_key = llm_cache.prompt_key("extract-info", PROMPT_VERSION, ocr_text)
+        cached = await run_in_threadpool(llm_cache.get, db, cache_key)
+        if cached is not None:
+            return Response(content=cached, media_type="application/json")
+            
+        # Get the shared Mistral client
+        client = get_mistral_client()
+        if client is None:
+            return ORJSONResponse(status_code=500, content={"error": "MISTRAL_API_KEY not set"})
 
         # Enhanced prompt for better extraction of name and variety
-        prompt = f"""
-I need to extract information from a seed packet's OCR text.
-Here's the text from the seed packet:
-
-{ocr_text}
-
-IMPORTANT FORMATTING GUIDELINES:
-- For the "name" field, provide ONLY the basic plant type (Tomato, Carrot, Lettuce, etc.)
-- For the "title" field, provide the full name as it appears on the packet 
-- For the "variety" field, extract the specific cultivar name separate from the basic name
-
-For example:
-- If the text mentions "Roma Tomatoes", then name="Tomato", variety="Roma"
-- If the text mentions "Jubilee Tomato", then name="Tomato", variety="Jubilee"
-- If the text mentions "Cherry Belle Radish", then name="Radish", variety="Cherry Belle"
-
-Extract these specific fields in JSON format:
-- name: Basic plant type (just "Tomato", "Carrot", etc.) without varieties
-- title: The complete name as shown on the packet
-- variety: Specific variety or cultivar name
-- description: Brief description of the plant
-- planting_instructions: How to plant the seeds
-- days_to_germination: Number of days until germination
-- spacing: Recommended spacing between plants
-- sun_exposure: Light requirements
-- soil_type: Soil requirements
-- watering: Watering needs
-- expiration_date: Date in YYYY-MM-DD format (if available)
-
-Return ONLY a JSON object with these fields. Use null for missing information.
-"""
+        prompt = _with_ocr_text(_PACKET_INFO_INSTRUCTIONS, ocr_text)
         # Simple message structure
         messages = [
             {"role": "user", "content": prompt}
         ]
 
         # Make API call
-        chat_response = client.chat.complete(
+        chat_response = await client.chat.complete_async(
             model=MISTRAL_CHAT_MODEL,
             messages=messages,
             response_format={"type": "json_object"},
-            temperature=0
+            temperature=0,
+            max_tokens=EXTRACTION_MAX_TOKENS
         )
 
         # Extract response
@@ -629,7 +835,7 @@ Return ONLY a JSON object with these fields. Use null for missing information.
         
         # Parse the JSON
         try:
-            extracted_data = json.loads(response_content)
+            extracted_data = _parse_extraction(response_content)
             
             # Check if we got meaningful data
             meaningful_fields = ['name', 'title', 'variety', 'description']
@@ -637,44 +843,102 @@ Return ONLY a JSON object with these fields. Use null for missing information.
             
             if not has_meaningful_data:
                 logger.warning("No meaningful data extracted from OCR text")
-                return JSONResponse(
+                return ORJSONResponse(
                     status_code=400,
                     content={"error": "Could not extract meaningful information from the image text"}
                 )
                 
-            return JSONResponse(content=extracted_data)
-        except json.JSONDecodeError:
-            return JSONResponse(
+            await run_in_threadpool(llm_cache.put, cache_key, orjson.dumps(extracted_data).decode())
+            return ORJSONResponse(content=extracted_data)
+        except ValidationError:
+            return ORJSONResponse(
                 status_code=500,
                 content={"error": "Could not parse response as JSON"}
             )
             
     except Exception as e:
         logger.exception(f"Error extracting info: {str(e)}")
-        return JSONResponse(
+        return ORJSONResponse(
+            status_code=500,
+            content={"error": f"Data extraction failed: {str(e)}"}
+        )
+
+@router.post("/seed-packets/extract-info/batch")
+async def extract_info_batch(request: Request, db: Session = Depends(get_db)):
+    """Extract structured data for several packets' OCR text in a single chat request"""
+    try:
+        body = await request.json()
+        ocr_texts = body.get('ocr_texts')
+        
+        if not ocr_texts or not isinstance(ocr_texts, list) or not all(isinstance(text, str) for text in ocr_texts):
+            return ORJSONResponse(status_code=400, content={"error": "ocr_texts must be a non-empty list of strings"})
+        if len(ocr_texts) > MAX_BATCH_EXTRACT:
+            return ORJSONResponse(
+                status_code=400,
+                content={"error": f"ocr_texts may hold at most {MAX_BATCH_EXTRACT} texts"}
+            )
+            
+        # Encode the list as JSON so no separator inside a text can collide with another batch
+        cache_key = llm_cache.prompt_key("extract-info-batch", PROMPT_VERSION, orjson.dumps(ocr_texts).decode())
+        cached = await run_in_threadpool(llm_cache.get, db, cache_key)
+        if cached is not None:
+            return Response(content=cached, media_type="application/json")
+            
+        client = get_mistral_client()
+        if client is None:
+            return ORJSONResponse(status_code=500, content={"error": "MISTRAL_API_KEY not set"})
+            
+        packets_text = "\n\n".join(
+            f"=== PACKET {index} ===\n{text}" for index, text in enumerate(ocr_texts, start=1)
+        )
+        chat_response = await client.chat.complete_async(
+            model=MISTRAL_CHAT_MODEL,
+            messages=[
+                {"role": "user", "content": _with_ocr_text(_PACKET_BATCH_INSTRUCTIONS, packets_text)}
+            ],
+            response_format={"type": "json_object"},
+            temperature=0,
+            max_tokens=EXTRACTION_MAX_TOKENS * len(ocr_texts)
+        )
+        
+        try:
+            reply = orjson.loads(chat_response.choices[0].message.content)
+            packets = _EXTRACT_LIST_ADAPTER.validate_python(reply.get("packets") if isinstance(reply, dict) else reply)
+        except (orjson.JSONDecodeError, ValidationError):
+            return ORJSONResponse(status_code=500, content={"error": "Could not parse response as JSON"})
+            
+        if len(packets) != len(ocr_texts):
+            logger.warning(f"Batch extraction returned {len(packets)} packets for {len(ocr_texts)} texts")
+            return ORJSONResponse(status_code=500, content={"error": "Extraction returned the wrong number of packets"})
+            
+        extracted = [packet.model_dump(mode="json", exclude_unset=True) for packet in packets]
+        await run_in_threadpool(llm_cache.put, cache_key, orjson.dumps(extracted).decode())
+        return ORJSONResponse(content=extracted)
+        
+    except Exception as e:
+        logger.exception(f"Error in batch extraction: {str(e)}")
+        return ORJSONResponse(
             status_code=500,
             content={"error": f"Data extraction failed: {str(e)}"}
         )
 
 @router.get("/seed-packets", response_class=HTMLResponse)
-async def seed_packets_page(
+def seed_packets_page(
     request: Request,
     name: Optional[str] = None,
     variety: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    query = db.query(SeedPacketModel)
+    query = db.query(SeedPacketModel).options(*_SEED_PACKET_SCHEMA_LOADS)
     filters = {"name": name, "variety": variety}
     query = apply_filters(query, SeedPacketModel, filters)
     db_seed_packets = query.order_by(SeedPacketModel.name).all()
     
     # Convert SQLAlchemy models to Pydantic models and ensure relationships are loaded
-    seed_packets = []
-    for packet in db_seed_packets:
-        pydantic_packet = SeedPacket.from_orm(packet)
+    seed_packets = list_adapter(SeedPacket).validate_python(db_seed_packets)
+    for pydantic_packet, packet in zip(seed_packets, db_seed_packets):
         # Load relationships explicitly to ensure they're available in the template
         pydantic_packet.plants = packet.plants
-        seed_packets.append(pydantic_packet)
     
     return templates.TemplateResponse(
         "seed_packets/list.html",
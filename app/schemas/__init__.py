@@ -1,19 +1,7 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from datetime import datetime, date
-from typing import Optional, List, ForwardRef
+from typing import Optional, List
 
 # Base Pydantic configuration
 class GardenBaseModel(BaseModel):
-    class Config:
-        from_attributes = True
-
-# Function to update forward references after all models are imported
-def update_forward_refs():
-    from app.schemas.plants import Plant
-    from app.schemas.notes import Note
-    from app.schemas.seed_packets import SeedPacket
-    from app.schemas.images import Image
-    
-    # Update models with forward references
-    SeedPacket.model_rebuild(force=True)
-    Image.model_rebuild(force=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
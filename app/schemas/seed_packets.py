@@ -1,16 +1,11 @@
-from typing import Optional, List, ForwardRef, TYPE_CHECKING
+from typing import Optional, List
 from datetime import date, datetime
+import re
+from pydantic import ConfigDict, field_validator
 from app.schemas import GardenBaseModel
 from app.schemas.images import Image
-
-# Use conditional imports to avoid circular dependencies
-if TYPE_CHECKING:
-    from app.schemas.plants import Plant
-    from app.schemas.notes import Note
-
-# Forward references for circular dependencies
-PlantRef = ForwardRef('Plant')
-NoteRef = ForwardRef('Note')
+from app.schemas.plants import Plant
+from app.schemas.notes import Note
 
 class SeedPacketBase(GardenBaseModel):
     name: str
@@ -32,8 +27,8 @@ class SeedPacket(SeedPacketBase):
     id: int
     created_at: datetime
     updated_at: datetime
-    plants: List[PlantRef] = []
-    notes: List[NoteRef] = []
+    plants: List[Plant] = []
+    notes: List[Note] = []
     images: List[Image] = []  # New field for multiple images
     
     # Property to ensure backward compatibility with templates
@@ -44,4 +39,76 @@ class SeedPacket(SeedPacketBase):
             return self.image_path
         elif self.images and len(self.images) > 0:
             return self.images[0].file_path
-        return None
\ No newline at end of file
+        return None
+
+_FIRST_NUMBER = re.compile(r"\d+")
+# Formats tried, in order, when the model does not answer in ISO form
+_DATE_FORMATS = ("%m/%d/%Y", "%d/%m/%Y", "%Y/%m/%d")
+
+class SeedPacketExtract(GardenBaseModel):
+    """
+    Seed packet fields returned by the OCR extraction prompts; every field is optional.
+    The validators coerce or drop a malformed value, so one bad field never
+    rejects the rest of the reply.
+    """
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+
+    name: Optional[str] = None
+    title: Optional[str] = None
+    variety: Optional[str] = None
+    description: Optional[str] = None
+    planting_instructions: Optional[str] = None
+    days_to_germination: Optional[int] = None
+    spacing: Optional[str] = None
+    sun_exposure: Optional[str] = None
+    soil_type: Optional[str] = None
+    watering: Optional[str] = None
+    expiration_date: Optional[date] = None
+
+    @field_validator(
+        "name", "title", "variety", "description", "planting_instructions",
+        "spacing", "sun_exposure", "soil_type", "watering",
+        mode="before",
+    )
+    @classmethod
+    def text_or_none(cls, value):
+        """Keep text; join a list of scalars into one string; drop anything else"""
+        if value is None or isinstance(value, str):
+            return value
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return str(value)
+        if isinstance(value, list) and all(isinstance(item, (str, int, float)) for item in value):
+            return ", ".join(str(item) for item in value)
+        return None
+
+    @field_validator("days_to_germination", mode="before")
+    @classmethod
+    def first_number(cls, value):
+        """Models often answer with a range such as "7-14 days" or a float; keep a whole lower bound"""
+        if isinstance(value, bool):
+            return None
+        if isinstance(value, int):
+            return value
+        if isinstance(value, float):
+            return int(value)
+        if isinstance(value, str):
+            match = _FIRST_NUMBER.search(value)
+            return int(match.group()) if match else None
+        return None
+
+    @field_validator("expiration_date", mode="before")
+    @classmethod
+    def parse_date_or_none(cls, value):
+        """Parse ISO dates on the fast path, then a few common formats; drop anything else"""
+        if isinstance(value, str):
+            try:
+                return date.fromisoformat(value)
+            except ValueError:
+                pass
+            for fmt in _DATE_FORMATS:
+                try:
+                    return datetime.strptime(value, fmt).date()
+                except ValueError:
+                    continue
+            return None
+        return value if isinstance(value, date) else None
@@ -0,0 +1,75 @@
+"""
+Exact-match cache for Mistral OCR and extraction calls.
+Re-uploading the same packet photo, or retrying after a UI error, is
+answered from the database instead of another OCR/chat round-trip.
+Keys hash the exact inputs; bump the caller's prompt version whenever a
+prompt changes so stale extractions are never served.
+Entries expire after LLM_CACHE_TTL_DAYS. Expired rows are never served and
+are pruned by a write at most once per LLM_CACHE_PRUNE_INTERVAL seconds.
+"""
+from datetime import datetime, timedelta
+from typing import Optional
+import hashlib
+import logging
+import threading
+import time
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.config import LLM_CACHE_TTL_DAYS, LLM_CACHE_PRUNE_INTERVAL
+from app.database import SessionLocal
+from app.models import LLMCache
+
+logger = logging.getLogger(__name__)
+
+# Monotonic time of this process's last prune; writes run in the threadpool
+_last_prune = float("-inf")
+_prune_lock = threading.Lock()
+
+def image_key(image_bytes: bytes) -> str:
+    """Key for the OCR result of an image"""
+    return hashlib.sha256(b"ocr:" + image_bytes).hexdigest()
+
+def prompt_key(purpose: str, prompt_version: str, text: str) -> str:
+    """Key for an extraction over ``text`` with a given prompt"""
+    return hashlib.sha256(f"{purpose}:{prompt_version}:{text}".encode()).hexdigest()
+
+def _cutoff() -> datetime:
+    return datetime.now() - timedelta(days=LLM_CACHE_TTL_DAYS)
+
+def _prune_due() -> bool:
+    """True for at most one write per LLM_CACHE_PRUNE_INTERVAL"""
+    global _last_prune
+    now = time.monotonic()
+    with _prune_lock:
+        if now - _last_prune < LLM_CACHE_PRUNE_INTERVAL:
+            return False
+        _last_prune = now
+        return True
+
+def get(db: Session, key: str) -> Optional[str]:
+    return db.execute(
+        select(LLMCache.value).where(LLMCache.key == key, LLMCache.created_at >= _cutoff())
+    ).scalar_one_or_none()
+
+def put(key: str, value: str) -> None:
+    """
+    Store a result in its own short-lived session, so the caller's request
+    session is never committed from here. Concurrent identical requests
+    race harmlessly: ON CONFLICT DO NOTHING keeps the first row.
+    A failed write is logged and dropped; the result is still returned.
+    """
+    try:
+        with SessionLocal() as db:
+            if _prune_due():
+                db.execute(delete(LLMCache).where(LLMCache.created_at < _cutoff()))
+            db.execute(
+                insert(LLMCache)
+                .values(key=key, value=value, created_at=datetime.now())
+                .on_conflict_do_nothing(index_elements=[LLMCache.key])
+            )
+            db.commit()
+    except SQLAlchemyError:
+        logger.exception("Failed to write LLM cache entry", extra={"key": key})
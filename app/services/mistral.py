@@ -0,0 +1,36 @@
+"""
+Shared Mistral client.
+Built once per process so OCR and chat calls reuse the same HTTP
+connection pool (keep-alive, TLS sessions) instead of reconnecting on
+every request.
+"""
+from typing import Optional, List, Any
+import httpx
+from mistralai import Mistral
+
+from app.config import get_mistral_api_key
+
+_mistral_client: Optional[Mistral] = None
+
+def get_mistral_client() -> Optional[Mistral]:
+    """Return the process-wide Mistral client, or None if no API key is configured"""
+    global _mistral_client
+    if _mistral_client is None:
+        api_key = get_mistral_api_key()
+        if not api_key:
+            return None
+        _mistral_client = Mistral(
+            api_key=api_key,
+            client=httpx.Client(limits=httpx.Limits(max_keepalive_connections=20)),
+            async_client=httpx.AsyncClient(limits=httpx.Limits(max_keepalive_connections=20))
+        )
+    return _mistral_client
+
+def ocr_pages(ocr_response: Any) -> List[Any]:
+    """Pages of an OCR response, read straight off the SDK model without dumping it"""
+    return getattr(ocr_response, "pages", None) or []
+
+def ocr_first_page_text(ocr_response: Any) -> str:
+    """Markdown of the first OCR page, or an empty string if nothing was recognised"""
+    pages = ocr_pages(ocr_response)
+    return (pages[0].markdown or "") if pages else ""
@@ -0,0 +1,32 @@
+"""
+Dropdown reference data shared by the list and detail pages.
+The statements are built once as lambda statements, so SQLAlchemy reuses
+their compiled SQL without re-analysing the query on every request.
+"""
+from typing import List
+from sqlalchemy import lambda_stmt, select
+from sqlalchemy.orm import Session
+
+from app.models import Plant, SeedPacket, GardenSupply, Year
+
+YEARS_DESC = lambda_stmt(lambda: select(Year).order_by(Year.year.desc()))
+PLANTS_BY_NAME = lambda_stmt(lambda: select(Plant).order_by(Plant.name))
+SEED_PACKETS_BY_NAME = lambda_stmt(lambda: select(SeedPacket).order_by(SeedPacket.name))
+SEED_PACKET_OPTIONS = lambda_stmt(lambda: select(SeedPacket.id, SeedPacket.name).order_by(SeedPacket.name))
+GARDEN_SUPPLIES_BY_NAME = lambda_stmt(lambda: select(GardenSupply).order_by(GardenSupply.name))
+
+def get_years(db: Session) -> List[Year]:
+    return db.execute(YEARS_DESC).scalars().all()
+
+def get_plants(db: Session) -> List[Plant]:
+    return db.execute(PLANTS_BY_NAME).scalars().all()
+
+def get_seed_packets(db: Session) -> List[SeedPacket]:
+    return db.execute(SEED_PACKETS_BY_NAME).scalars().all()
+
+def get_seed_packet_options(db: Session):
+    """Only the (id, name) pairs a seed packet dropdown needs."""
+    return db.execute(SEED_PACKET_OPTIONS).all()
+
+def get_garden_supplies(db: Session) -> List[GardenSupply]:
+    return db.execute(GARDEN_SUPPLIES_BY_NAME).scalars().all()
@@ -0,0 +1,38 @@
+"""
+Process-local cache of Pydantic schemas built from catalog rows.
+Plants change rarely, so the plants page reuses the validated schema of
+a row until its version changes instead of running model_validate over
+every row on every render.
+Cached schemas are shared between requests: treat them as read-only.
+"""
+from collections import OrderedDict
+import threading
+from typing import Any, Hashable, Type, TypeVar
+from pydantic import BaseModel
+
+MAX_ENTRIES = 4096
+
+SchemaT = TypeVar("SchemaT", bound=BaseModel)
+
+_cache: "OrderedDict[Hashable, BaseModel]" = OrderedDict()
+# Sync page handlers run in the threadpool, so guard the LRU bookkeeping
+_lock = threading.Lock()
+
+def images_version(row: Any) -> tuple:
+    """Version of a row's images; attaching or editing one does not touch the row's updated_at"""
+    return tuple((image.id, image.updated_at) for image in row.images)
+
+def cached_model(schema: Type[SchemaT], row: Any, version: Hashable) -> SchemaT:
+    """Validated ``schema`` for ``row``, rebuilt only when ``version`` changes"""
+    key = (schema, row.id, version)
+    with _lock:
+        model = _cache.get(key)
+        if model is not None:
+            _cache.move_to_end(key)
+            return model
+    model = schema.model_validate(row)
+    with _lock:
+        _cache[key] = model
+        if len(_cache) > MAX_ENTRIES:
+            _cache.popitem(last=False)
+    return model
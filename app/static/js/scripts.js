@@ -33,4 +33,58 @@ function formatDate(date) {
 // Format timestamps
 function formatTimestamp(timestamp) {
     return new Date(timestamp).toLocaleString();
-}
\ No newline at end of file
+}
+// Infinite scroll for paginated lists: fetch the next page when the
+// "Load more" link comes into view and append its items in place
+document.addEventListener('DOMContentLoaded', function() {
+    const list = document.querySelector('[data-page-items]');
+    if (!list || !('IntersectionObserver' in window)) return;
+
+    const observer = new IntersectionObserver(async function(entries) {
+        for (const entry of entries) {
+            if (!entry.isIntersecting) continue;
+            const container = entry.target;
+            observer.unobserve(container);
+
+            try {
+                const response = await fetch(container.querySelector('a').href);
+                const page = new DOMParser().parseFromString(await response.text(), 'text/html');
+                const items = page.querySelector('[data-page-items]');
+                if (items) {
+                    list.append(...items.children);
+                }
+                const next = page.querySelector('[data-load-more]');
+                if (next) {
+                    container.replaceWith(next);
+                    observer.observe(next);
+                } else {
+                    container.remove();
+                }
+            } catch (error) {
+                console.error('Error loading more items:', error);
+            }
+        }
+    });
+
+    const loadMore = document.querySelector('[data-load-more]');
+    if (loadMore) observer.observe(loadMore);
+});
+
+// Drop empty file inputs from the FormData of edit forms whose image is
+// optional (marked data-optional-image), so edits without a new image don't
+// send (and make the server spool) an empty part
+document.addEventListener('formdata', function(e) {
+    if (!e.target.matches('form[data-optional-image]')) return;
+    const empty = new Set();
+    const filled = new Set();
+    for (const [name, value] of e.formData.entries()) {
+        if (value instanceof File && !value.name && value.size === 0) {
+            empty.add(name);
+        } else {
+            filled.add(name);
+        }
+    }
+    empty.forEach(name => {
+        if (!filled.has(name)) e.formData.delete(name);
+    });
+}, true);
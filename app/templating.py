@@ -0,0 +1,46 @@
+"""
+The one Jinja2 environment shared by the app and every router.
+A single environment means a single compiled-template cache for the
+process, and the same JSON policy on every page.
+"""
+from fastapi.templating import Jinja2Templates
+from sqlalchemy import inspect as sa_inspect
+from datetime import date
+from uuid import UUID
+import orjson
+import functools
+import pydantic
+
+from .config import DEBUG
+
+# Values orjson serializes natively; anything else on a plain object
+# (collections of models, etc.) is stringified
+_JSON_NATIVE_TYPES = (str, int, float, bool, type(None), date, UUID)
+
+@functools.lru_cache(maxsize=64)
+def _column_keys(cls):
+    """Mapped column attribute names of a SQLAlchemy model class (static per class)"""
+    return tuple(attr.key for attr in sa_inspect(cls).column_attrs)
+
+def _json_default(obj):
+    """orjson fallback for Pydantic models and SQLAlchemy models"""
+    if isinstance(obj, pydantic.BaseModel):
+        return obj.model_dump()
+    if hasattr(type(obj), '__mapper__'):
+        # SQLAlchemy models serialize their columns; orjson handles the value types
+        return {key: getattr(obj, key) for key in _column_keys(type(obj))}
+    if hasattr(obj, '__dict__'):
+        return {
+            key: value if isinstance(value, _JSON_NATIVE_TYPES) or type(value) in (list, dict) else str(value)
+            for key, value in obj.__dict__.items()
+            if not key.startswith('_')
+        }
+    return str(obj)
+
+def custom_json_dumps(obj, **kwargs):
+    option = orjson.OPT_SORT_KEYS if kwargs.get('sort_keys') else 0
+    return orjson.dumps(obj, default=_json_default, option=option).decode()
+
+# Keep every compiled template; only re-check the files on disk while debugging
+templates = Jinja2Templates(directory="app/templates", cache_size=-1, auto_reload=DEBUG)
+templates.env.policies['json.dumps_function'] = custom_json_dumps
@@ -1,10 +1,17 @@
 import os
 import logging
 from fastapi import UploadFile, HTTPException
+from fastapi.responses import StreamingResponse, ORJSONResponse
+from fastapi.templating import Jinja2Templates
 from pathlib import Path
 import shutil
+import base64
+import functools
+from itertools import chain, islice
+import orjson
 from uuid import uuid4
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple, Type, Iterable, Iterator
+from pydantic import BaseModel, TypeAdapter
 from datetime import datetime
 import imghdr
 from sqlalchemy.orm import Query
@@ -16,7 +23,12 @@ logger = logging.getLogger(__name__)
 # Use the upload folder from config
 UPLOAD_DIR = Path(UPLOAD_FOLDER)
 ALLOWED_IMAGE_TYPES = {"jpeg", "jpg", "png", "gif"}
+IMAGE_FORMAT_BY_EXTENSION = {".png": "png", ".gif": "gif", ".jpg": "jpeg", ".jpeg": "jpeg"}
 MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+DEFAULT_PAGE_SIZE = 50
+STREAM_BATCH_SIZE = 500
+MAX_PAGE_SIZE = 200
 
 def validate_image(file: UploadFile) -> bool:
     """
@@ -99,6 +111,7 @@ def save_upload_file(file: UploadFile) -> Optional[str]:
     """
     Save an uploaded file to the filesystem
     Returns the relative path to the file, or None if save failed or no file provided
+    Copies in fixed-size chunks and blocks: async callers should run it in the threadpool
     """
     try:
         if not file or not file.filename:
@@ -114,7 +127,7 @@ def save_upload_file(file: UploadFile) -> Optional[str]:
         
         # Save file
         with file_path.open("wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+            shutil.copyfileobj(file.file, buffer, UPLOAD_CHUNK_SIZE)
         
         relative_path = f"/uploads/{filename}"
         logger.info("File uploaded successfully", extra={
@@ -162,28 +175,61 @@ def delete_upload_file(file_path: str) -> bool:
         })
         return False
 
+def copy_file(source: str, destination: str) -> None:
+    """
+    Copy a file inside the kernel with os.sendfile, so the bytes never pass
+    through a userspace buffer. Falls back to shutil.copyfile where sendfile
+    is unavailable. Blocking: call it from a worker thread in async handlers.
+    """
+    if not hasattr(os, "sendfile"):
+        shutil.copyfile(source, destination)
+        return
+    with open(source, "rb") as src, open(destination, "wb") as dst:
+        remaining = os.fstat(src.fileno()).st_size
+        offset = 0
+        while remaining > 0:
+            sent = os.sendfile(dst.fileno(), src.fileno(), offset, remaining)
+            if sent == 0:
+                break
+            offset += sent
+            remaining -= sent
+
+def link_or_copy_file(source: str, destination: str) -> None:
+    """
+    Give an upload a second name with a hard link, so no bytes are copied.
+    Uploads are never modified in place and deleting one only unlinks its own
+    name, so the two paths behave as independent files. Falls back to
+    copy_file across filesystems or where links are not supported.
+    """
+    try:
+        os.link(source, destination)
+    except OSError:
+        copy_file(source, destination)
+
 def apply_filters(query: Query, model: Any, filters: Dict[str, Any]) -> Query:
     """
     Apply filters to a SQLAlchemy query based on a dictionary of filter parameters.
-    Handles None values by skipping those filters.
+    Handles None values by skipping those filters. The caller's dict is left
+    untouched, so pages can pass the same dict back to the template.
     """
     try:
-        for field, value in filters.items():
-            if value is not None:
-                if isinstance(value, list):
-                    query = query.filter(getattr(model, field).in_(value))
-                elif isinstance(value, (datetime, int, str)):
-                    query = query.filter(getattr(model, field) == value)
-                elif field.endswith('_min'):
-                    actual_field = field[:-4]
-                    query = query.filter(getattr(model, actual_field) >= value)
-                elif field.endswith('_max'):
-                    actual_field = field[:-4]
-                    query = query.filter(getattr(model, actual_field) <= value)
+        # Unset query params are dropped once, up front
+        provided = {field: value for field, value in filters.items() if value is not None}
+        for field, value in provided.items():
+            if isinstance(value, list):
+                query = query.filter(getattr(model, field).in_(value))
+            elif isinstance(value, (datetime, int, str)):
+                query = query.filter(getattr(model, field) == value)
+            elif field.endswith('_min'):
+                actual_field = field[:-4]
+                query = query.filter(getattr(model, actual_field) >= value)
+            elif field.endswith('_max'):
+                actual_field = field[:-4]
+                query = query.filter(getattr(model, actual_field) <= value)
         
         logger.debug("Filters applied successfully", extra={
             "model": model.__name__,
-            "filters": filters
+            "filters": provided
         })
         return query
         
@@ -196,4 +242,82 @@ def apply_filters(query: Query, model: Any, filters: Dict[str, Any]) -> Query:
         raise ValidationException(
             detail="Error applying filters",
             field_errors={"filters": str(e)}
-        )
\ No newline at end of file
+        )
+
+def paginate(query: Query, limit: int) -> Tuple[List[Any], bool]:
+    """
+    Fetch one page of an already filtered and ordered query.
+    Reads limit + 1 rows so the caller can tell whether another page exists
+    without issuing a separate COUNT query.
+    """
+    rows = query.limit(limit + 1).all()
+    return rows[:limit], len(rows) > limit
+
+
+def stream_template(templates: Jinja2Templates, name: str, context: Dict[str, Any]) -> StreamingResponse:
+    """
+    Render a template as a stream of chunks instead of one buffered string.
+    The first bytes go out while the rest of the page (and any lazy loads it
+    triggers) is still rendering.
+    """
+    template = templates.get_template(name)
+    return StreamingResponse(template.generate(context), media_type="text/html")
+
+
+@functools.lru_cache(maxsize=None)
+def list_adapter(schema: Type[BaseModel]) -> TypeAdapter:
+    """TypeAdapter for List[schema], built once per schema"""
+    return TypeAdapter(List[schema])
+
+
+def model_list_response(schema: Type[BaseModel], rows: Iterable[Any]) -> ORJSONResponse:
+    """
+    Serialize ORM rows through a Pydantic schema straight into an ORJSONResponse.
+    Returning a Response skips FastAPI's response_model validation and
+    jsonable_encoder pass; the route's response_model still documents the schema.
+    The whole list is validated and dumped in one call each through a TypeAdapter.
+    """
+    adapter = list_adapter(schema)
+    return ORJSONResponse(adapter.dump_python(adapter.validate_python(rows)))
+
+
+def _json_array_chunks(schema: Type[BaseModel], rows: Iterable[Any]) -> Iterator[bytes]:
+    yield b"["
+    for index, row in enumerate(rows):
+        if index:
+            yield b","
+        yield orjson.dumps(schema.model_validate(row).model_dump())
+    yield b"]"
+
+
+def stream_model_list(schema: Type[BaseModel], query: Query, batch_size: int = STREAM_BATCH_SIZE) -> StreamingResponse:
+    """
+    Stream an unpaginated query as a JSON array, one row at a time.
+    yield_per fetches rows in batches from a server-side cursor, so peak memory
+    follows the batch size instead of the table size. Eager loads must be
+    many-to-one joins or selectin loads; joined collections do not batch.
+    The first batch is fetched before the response starts, so a failing query
+    still surfaces as a 5xx; a failure mid-stream can only truncate the body,
+    since the 200 status line has already been sent. The route's
+    response_model is not applied to the stream and only documents the shape.
+    """
+    rows = iter(query.yield_per(batch_size))
+    first_batch = list(islice(rows, batch_size))
+    return StreamingResponse(
+        _json_array_chunks(schema, chain(first_batch, rows)),
+        media_type="application/json",
+    )
+
+
+def image_format_for(filename: str) -> str:
+    """Image format for a data URL, from the file extension (defaults to jpeg)"""
+    return IMAGE_FORMAT_BY_EXTENSION.get(os.path.splitext(filename)[1].lower(), "jpeg")
+
+
+def image_data_url(image_bytes: bytes, image_format: str) -> str:
+    """
+    Build a base64 data URL for an image held in memory.
+    The prefix is joined onto the encoded bytes and decoded once, rather than
+    decoding the base64 payload to a str and copying it again into an f-string.
+    """
+    return (b"data:image/" + image_format.encode() + b";base64," + base64.b64encode(image_bytes)).decode("ascii")
@@ -0,0 +1,29 @@
+"""add composite indexes for list filters
+
+Revision ID: add_list_filter_indexes
+Revises: a9cb2876c060
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_list_filter_indexes'
+down_revision = 'a9cb2876c060'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_note_plant_ts', 'notes', ['plant_id', 'timestamp'])
+    op.create_index('ix_note_seed_ts', 'notes', ['seed_packet_id', 'timestamp'])
+    op.create_index('ix_note_supply_ts', 'notes', ['garden_supply_id', 'timestamp'])
+    op.create_index('ix_harvest_plant_ts', 'harvests', ['plant_id', 'timestamp'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_harvest_plant_ts', table_name='harvests')
+    op.drop_index('ix_note_supply_ts', table_name='notes')
+    op.drop_index('ix_note_seed_ts', table_name='notes')
+    op.drop_index('ix_note_plant_ts', table_name='notes')
@@ -0,0 +1,32 @@
+"""add llm_cache table
+
+Revision ID: add_llm_cache
+Revises: add_recent_item_indexes
+Create Date: 2026-10-16 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_llm_cache'
+down_revision = 'add_recent_item_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'llm_cache',
+        sa.Column('key', sa.String(length=64), nullable=False),
+        sa.Column('value', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('key')
+    )
+    op.create_index('ix_llm_cache_created_at', 'llm_cache', ['created_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_llm_cache_created_at', table_name='llm_cache')
+    op.drop_table('llm_cache')
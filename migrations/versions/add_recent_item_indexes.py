@@ -0,0 +1,31 @@
+"""add indexes for the dashboard's most-recent queries
+
+Revision ID: add_recent_item_indexes
+Revises: add_list_filter_indexes
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_recent_item_indexes'
+down_revision = 'add_list_filter_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Postgres scans a btree index backwards, so ORDER BY ... DESC LIMIT n
+    # is served by a plain ascending index
+    op.create_index('ix_plants_created_at', 'plants', ['created_at'])
+    op.create_index('ix_notes_timestamp', 'notes', ['timestamp'])
+    op.create_index('ix_seed_packets_created_at', 'seed_packets', ['created_at'])
+    op.create_index('ix_garden_supplies_created_at', 'garden_supplies', ['created_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_garden_supplies_created_at', table_name='garden_supplies')
+    op.drop_index('ix_seed_packets_created_at', table_name='seed_packets')
+    op.drop_index('ix_notes_timestamp', table_name='notes')
+    op.drop_index('ix_plants_created_at', table_name='plants')
@@ -0,0 +1,40 @@
+"""maintain updated_at with a database trigger
+
+Revision ID: add_updated_at_triggers
+Revises: add_llm_cache
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_updated_at_triggers'
+down_revision = 'add_llm_cache'
+branch_labels = None
+depends_on = None
+
+TABLES = ('plants', 'seed_packets', 'garden_supplies', 'images')
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+        BEGIN
+            NEW.updated_at := now();
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    for table in TABLES:
+        op.execute(
+            f"CREATE TRIGGER trg_{table}_updated_at BEFORE UPDATE ON {table} "
+            "FOR EACH ROW WHEN (OLD::text IS DISTINCT FROM NEW::text) "
+            "EXECUTE FUNCTION set_updated_at()"
+        )
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_updated_at ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS set_updated_at()")
@@ -0,0 +1,27 @@
+from datetime import date
+
+from app.schemas.seed_packets import SeedPacketExtract
+
+
+def test_malformed_fields_are_coerced_without_rejecting_the_reply():
+    extract = SeedPacketExtract.model_validate_json(
+        '{"name": "Tomato", "days_to_germination": 7.5,'
+        ' "spacing": ["18 in", "24 in"], "watering": {"often": true},'
+        ' "expiration_date": "2026-12-31"}'
+    )
+
+    assert extract.name == "Tomato"
+    assert extract.days_to_germination == 7
+    assert extract.spacing == "18 in, 24 in"
+    assert extract.watering is None
+    assert extract.expiration_date == date(2026, 12, 31)
+
+
+def test_ranges_and_unparseable_values():
+    extract = SeedPacketExtract.model_validate(
+        {"days_to_germination": "7-14 days", "sun_exposure": [["nested"]], "expiration_date": "soon"}
+    )
+
+    assert extract.days_to_germination == 7
+    assert extract.sun_exposure is None
+    assert extract.expiration_date is None